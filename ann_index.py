@@ -0,0 +1,170 @@
+import numpy as np
+from embedding_store import EmbeddingStore, _normalize
+from top_n import top_n_indices
+
+
+class IVFIndex:
+    """Approximate nearest-neighbour index (inverted file over k-means cells)
+    
+    Vectors are assigned to the closest of n_lists coarse centroids
+    (spherical k-means, so cosine similarity is preserved). A query only
+    scans the n_probe closest cells; raising n_probe trades latency for
+    recall, and n_probe == n_lists is an exact search.
+    
+    Until min_train_size vectors have been added they are kept in a plain
+    EmbeddingStore and searched exhaustively (k-means on a handful of
+    points gives useless cells). The cells are trained at that point and
+    retrained whenever the index grows retrain_factor times past the
+    number of vectors they were trained on (up to sample_size).
+    
+    Exposes the same query/query_batch interface as EmbeddingStore, so the
+    two are interchangeable in CandidateMatchingSystem.
+    """
+    
+    def __init__(self, n_lists=256, n_probe=8, n_iter=10, sample_size=65536, min_train_size=None,
+                 retrain_factor=4, seed=0):
+        self.n_lists = n_lists
+        self.target_lists = n_lists
+        self.n_probe = n_probe
+        self.n_iter = n_iter
+        self.sample_size = sample_size
+        # ~39 points per centroid is the usual minimum for a useful k-means fit
+        self.min_train_size = min_train_size if min_train_size is not None else 39 * n_lists
+        self.retrain_factor = retrain_factor
+        self.trained_size = 0
+        self.seed = seed
+        self.centroids = None
+        self.lists = []
+        self.id_list = {}
+        self.pending = EmbeddingStore()
+    
+    @classmethod
+    def from_dict(cls, embeddings, **kwargs):
+        """Train and fill an index from a {candidate_id: embedding} dict"""
+        index = cls(**kwargs)
+        index.add_many(embeddings.items())
+        return index
+    
+    def __len__(self):
+        return len(self.id_list)
+    
+    def __contains__(self, candidate_id):
+        return candidate_id in self.id_list
+    
+    @property
+    def is_trained(self):
+        return self.centroids is not None
+    
+    def train(self, vectors):
+        """Fit the coarse centroids with spherical k-means on a sample (empties the index)"""
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+        self.trained_size = len(vectors)
+        rng = np.random.default_rng(self.seed)
+        if len(vectors) > self.sample_size:
+            vectors = vectors[rng.choice(len(vectors), self.sample_size, replace=False)]
+        
+        n_lists = max(1, min(self.target_lists, len(vectors)))
+        centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+        for _ in range(self.n_iter):
+            assignment = self._assign(vectors, centroids)
+            order = np.argsort(assignment, kind='stable')
+            counts = np.bincount(assignment, minlength=n_lists)
+            sums = np.zeros_like(centroids)
+            filled = counts > 0
+            sums[filled] = np.add.reduceat(vectors[order], np.cumsum(counts)[filled] - counts[filled])
+            # Re-seed empty cells with random points
+            empty = np.flatnonzero(~filled)
+            sums[empty] = vectors[rng.choice(len(vectors), len(empty))]
+            centroids = _normalize(sums)
+        
+        self.centroids = centroids
+        self.n_lists = n_lists
+        self.lists = [EmbeddingStore(dim=vectors.shape[1], capacity=64) for _ in range(n_lists)]
+        self.id_list = {}
+        self.pending = EmbeddingStore()
+    
+    def add(self, candidate_id, embedding):
+        """Insert or replace the embedding of one candidate"""
+        self.add_many([(candidate_id, embedding)])
+    
+    def add_many(self, items):
+        """Insert or replace embeddings (the last one wins when an id repeats); trains once enough are added"""
+        items = list(dict(items).items())
+        if not items:
+            return
+        for candidate_id, _ in items:
+            if candidate_id in self.id_list:
+                self.remove(candidate_id)
+        
+        if not self.is_trained:
+            self.pending.add_many(items)
+            for candidate_id, _ in items:
+                self.id_list[candidate_id] = None
+            if len(self.pending) >= self.min_train_size:
+                self._retrain()
+            return
+        
+        vectors = np.asarray([embedding for _, embedding in items], dtype=np.float32)
+        assignment = self._assign(_normalize(vectors), self.centroids)
+        
+        # Group by cell so each inverted list is extended in one call
+        order = np.argsort(assignment, kind='stable')
+        bounds = np.flatnonzero(np.diff(assignment[order])) + 1
+        for rows in np.split(order, bounds):
+            cell = int(assignment[rows[0]])
+            self.lists[cell].add_many((items[i][0], vectors[i]) for i in rows)
+            for i in rows:
+                self.id_list[items[i][0]] = cell
+        
+        if len(self) >= self.retrain_factor * self.trained_size and self.trained_size < self.sample_size:
+            self._retrain()
+    
+    def _retrain(self):
+        """Train on everything stored so far and re-add it"""
+        ids, vectors = [], []
+        for store in [self.pending] + self.lists:
+            if len(store):
+                ids.extend(store.ids)
+                vectors.append(store.matrix.copy())
+        vectors = np.concatenate(vectors)
+        self.train(vectors)
+        self.add_many(zip(ids, vectors))
+    
+    def remove(self, candidate_id):
+        """Delete a candidate from the index"""
+        cell = self.id_list.pop(candidate_id)
+        if cell is None:
+            self.pending.remove(candidate_id)
+        else:
+            self.lists[cell].remove(candidate_id)
+    
+    def query(self, job_embedding, top_n=20, n_probe=None):
+        """Return approximately the top_n most similar candidate ids with their similarity"""
+        if not self.id_list:
+            return []
+        if not self.is_trained:
+            return self.pending.query(job_embedding, top_n)
+        query = _normalize(np.asarray(job_embedding, dtype=np.float32).reshape(1, -1))[0]
+        cells = top_n_indices(self.centroids @ query, n_probe or self.n_probe)
+        
+        ids, scores = [], []
+        for cell in cells:
+            store = self.lists[cell]
+            if len(store):
+                ids.extend(store.ids)
+                scores.append(store.matrix @ query)
+        if not scores:
+            return []
+        scores = np.concatenate(scores)
+        return [(ids[i], float(scores[i])) for i in top_n_indices(scores, top_n)]
+    
+    def query_batch(self, job_embeddings, top_n=20, n_probe=None):
+        """Run query for many job embeddings"""
+        return [self.query(job_embedding, top_n, n_probe) for job_embedding in job_embeddings]
+    
+    def _assign(self, vectors, centroids, chunk_size=65536):
+        """Index of the most similar centroid for each (normalized) vector"""
+        return np.concatenate([
+            np.argmax(vectors[start:start + chunk_size] @ centroids.T, axis=1)
+            for start in range(0, len(vectors), chunk_size)
+        ]) if len(vectors) else np.zeros(0, dtype=np.int64)
@@ -0,0 +1,70 @@
+"""Recall vs latency of IVFIndex against exact EmbeddingStore search.
+
+Usage: python benchmarks/ann_benchmark.py --candidates 1000000 --dim 300
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from embedding_store import EmbeddingStore
+from ann_index import IVFIndex
+
+
+def make_vectors(n, dim, n_clusters, rng):
+    """Clustered random vectors, closer to real embeddings than pure noise"""
+    centers = rng.standard_normal((n_clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, n_clusters, n)
+    return centers[labels] + 0.5 * rng.standard_normal((n, dim)).astype(np.float32)
+
+
+def timed_queries(index, queries, top_n, **kwargs):
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append([candidate_id for candidate_id, _ in index.query(query, top_n, **kwargs)])
+        latencies.append((time.perf_counter() - start) * 1000)
+    return results, np.array(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=200000)
+    parser.add_argument("--dim", type=int, default=300)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-n", type=int, default=20)
+    parser.add_argument("--lists", type=int, default=1024)
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 4, 8, 16, 32, 64])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = make_vectors(args.candidates, args.dim, 512, rng)
+    queries = make_vectors(args.queries, args.dim, 512, rng)
+    ids = list(range(args.candidates))
+
+    start = time.perf_counter()
+    exact = EmbeddingStore(dim=args.dim, capacity=args.candidates)
+    exact.add_many(zip(ids, vectors))
+    print(f"Exact store built in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    ivf = IVFIndex(n_lists=args.lists)
+    ivf.train(vectors)
+    ivf.add_many(zip(ids, vectors))
+    print(f"IVF index ({ivf.n_lists} lists) built in {time.perf_counter() - start:.1f}s")
+
+    truth, exact_latency = timed_queries(exact, queries, args.top_n)
+    print(f"\n{'method':<16}{'recall@' + str(args.top_n):>12}{'p50 ms':>10}{'p95 ms':>10}")
+    print(f"{'exact':<16}{1.0:>12.3f}{np.percentile(exact_latency, 50):>10.2f}{np.percentile(exact_latency, 95):>10.2f}")
+
+    for n_probe in args.probes:
+        found, latency = timed_queries(ivf, queries, args.top_n, n_probe=n_probe)
+        recall = np.mean([len(set(a) & set(b)) / len(b) for a, b in zip(found, truth)])
+        label = f"ivf n_probe={n_probe}"
+        print(f"{label:<16}{recall:>12.3f}{np.percentile(latency, 50):>10.2f}{np.percentile(latency, 95):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
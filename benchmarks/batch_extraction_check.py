@@ -0,0 +1,91 @@
+"""Batched vs single-item project extraction against the fake LLM.
+
+Checks that run_llm_batch_extraction returns the same per-description
+results as run_llm_extraction (also when the fake drops items and they
+must be retried) and reports LLM round trips. Also checks that a batch
+answered with unparseable text is retried past the response cache.
+Exits non-zero on mismatch.
+Usage: python benchmarks/batch_extraction_check.py --positions 15 --drop-rate 0.3
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "models"))
+sys.path.insert(0, HERE)
+import cleaned
+from fake_llm import FakeLLM
+from llm_cache import LLMResponseCache
+from llm_runner import StatelessLLM
+
+
+def descriptions(n):
+    with open(os.path.join(HERE, "..", "Resume_parsed.json")) as f:
+        data = json.load(f)
+    roles = [job["aboutRole"] for job in data.get("devEmployment", []) if job.get("aboutRole")]
+    return [f"{roles[i % len(roles)]} (position {i})" for i in range(n)]
+
+
+class GarbledFirstLLM(FakeLLM):
+    """Answers the first batched prompt with text that is not JSON"""
+
+    def respond(self, prompt):
+        if self.calls == 1:
+            return "Sorry, something went wrong."
+        return super().respond(prompt)
+
+
+async def single(llm, texts):
+    return [await cleaned.run_llm_extraction(llm, text) for text in texts]
+
+
+def fail(message):
+    print(f"FAIL: {message}")
+    sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--positions", type=int, default=15)
+    parser.add_argument("--drop-rate", type=float, default=0.3)
+    args = parser.parse_args()
+    texts = descriptions(args.positions)
+
+    single_llm = FakeLLM(latency=0)
+    expected = asyncio.run(single(single_llm, texts))
+
+    batch_llm = FakeLLM(latency=0, drop_rate=args.drop_rate)
+    # Enough retries that every dropped item eventually comes back
+    got = asyncio.run(cleaned.run_llm_batch_extraction(batch_llm, texts, retries=20))
+
+    print(f"{args.positions} descriptions: single-item {single_llm.calls} LLM calls, batched {batch_llm.calls} LLM calls")
+    if got != expected:
+        fail("batched results differ from single-item results")
+    first_round = -(-args.positions // cleaned.LLM_BATCH_SIZE)
+    if args.drop_rate > 0 and batch_llm.calls <= first_round:
+        fail("no item was dropped, so the retry path did not run (raise --drop-rate)")
+    print("OK: batched results match single-item results")
+
+    # A whole batch comes back unparseable: the retry must reach the LLM, not the cached reply
+    garbled = GarbledFirstLLM(latency=0)
+    with tempfile.TemporaryDirectory() as directory:
+        cache = LLMResponseCache(os.path.join(directory, "llm_cache.sqlite3"))
+        llm = StatelessLLM(llm=garbled, cache=cache)
+        got = asyncio.run(cleaned.run_llm_batch_extraction(llm, texts, retries=1))
+        stored = cache.get(llm.model_name, cleaned.build_batch_extraction_prompt(
+            [{"id": i, "description": text} for i, text in enumerate(texts)][:cleaned.LLM_BATCH_SIZE]
+        ))
+        cache._db.close()
+    if got != expected:
+        fail("results after an unparseable batch differ from single-item results")
+    if stored is not None:
+        fail("the unparseable reply was cached")
+    print(f"OK: unparseable batch retried with {garbled.calls} LLM calls, nothing cached for it")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Memory per candidate: preprocessed dicts vs CandidateStore.
+
+Usage: python benchmarks/candidate_store_benchmark.py --candidates 200000
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from candidate_store import CandidateStore, deep_sizeof
+
+REGIONS = ["IN", "US", "GB", "DE", "PK", "NG", "BR", ""]
+DEGREES = ["Bachelor of Technology", "MSc. Computer Science", "MBA", "PhD", "Diploma", None]
+TITLES = ["Software Engineer", "Senior Software Engineer", "Full Stack Developer", "Tech Lead",
+          "Frontend Developer", "Backend Developer", "Data Engineer", "Engineering Manager"]
+SKILLS = ["React", "Node.js", "JavaScript", "TypeScript", "HTML", "CSS", "MongoDB", "Python", "Java",
+          "Docker", "Kubernetes", "AWS", "SQL", "PostgreSQL", "Django", "Spring Boot", "Git", "Linux"]
+TESTS = ["Back-End Developer (Node)", "Front-End Developer (React)", "Python basics", "SQL"]
+
+
+def make_candidates(n, rng):
+    """Synthetic preprocess_candidate_data output (fresh string objects, like JSON decoding gives)"""
+    candidates = []
+    for i in range(n):
+        n_jobs = int(rng.integers(0, 5))
+        candidates.append({
+            "candidate_id": f"{i:024x}",
+            "name": f"Candidate {i}",
+            "email": f"candidate{i}@example.com",
+            "location": "".join(rng.choice(REGIONS)),
+            "coordinates": (float(rng.uniform(-60, 60)), float(rng.uniform(-180, 180))) if rng.random() < 0.5 else None,
+            "job_preference": ["".join(p) for p in rng.choice(["remote", "onsite", "hybrid"], int(rng.integers(0, 3)), replace=False)],
+            "total_experience": int(rng.integers(0, 15)),
+            "avg_job_tenure": int(rng.integers(1, 60)) if n_jobs else None,
+            "job_titles": ["".join(t) for t in rng.choice(TITLES, n_jobs)],
+            "companies": [f"Company {int(c)}" for c in rng.integers(0, 5000, n_jobs)],
+            "has_leadership_exp": bool(rng.random() < 0.2),
+            "degrees": ["".join(d) for d in rng.choice(DEGREES[:-1], int(rng.integers(0, 3)))],
+            "institutions": [f"University {int(u)}" for u in rng.integers(0, 800, int(rng.integers(0, 3)))],
+            "highest_degree": DEGREES[int(rng.integers(0, len(DEGREES)))],
+            "skills": ["".join(s) for s in rng.choice(SKILLS, int(rng.integers(0, 15)), replace=False)],
+            "tech_test_results": [
+                {"test_name": "".join(rng.choice(TESTS)), "score": int(rng.integers(0, 100)), "passed": bool(rng.random() < 0.5)}
+                for _ in range(int(rng.integers(0, 3)))
+            ],
+            "english_test_passed": bool(rng.random() < 0.5),
+            "current_salary": "",
+            "expected_salary": str(int(rng.integers(1, 40))) if rng.random() < 0.8 else "",
+            "salary_currency": "".join(rng.choice(["USD", "INR", "EUR"])),
+            "salary_duration": "annually",
+        })
+    return candidates
+
+
+def traced(function):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, allocated, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=100000)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    candidates, dict_bytes, elapsed = traced(lambda: make_candidates(args.candidates, rng))
+    print(f"dicts:          {dict_bytes / args.candidates:8.0f} B/candidate traced, "
+          f"{deep_sizeof(candidates) / args.candidates:8.0f} B/candidate deep size")
+
+    store, store_bytes, elapsed = traced(lambda: CandidateStore(candidates))
+    print(f"CandidateStore: {store_bytes / args.candidates:8.0f} B/candidate traced, "
+          f"{store.memory_per_candidate():8.0f} B/candidate deep size (built in {elapsed:.2f}s)")
+
+    start = time.perf_counter()
+    rows = store.to_dicts()
+    print(f"to_dict:        {(time.perf_counter() - start) / args.candidates * 1e6:8.2f} us/candidate")
+    assert rows == candidates
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Company name resolution in CompanyProfileStore.
+
+Checks that spelling variants of one employer resolve to one canonical key
+and one fetch, and that distinct companies sharing a first word (and a
+truncated name that could be either of them) are kept apart. Exits
+non-zero on mismatch.
+Usage: python benchmarks/company_store_check.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "models"))
+from company_store import CompanyProfileStore
+
+SAME = [
+    ["Archs Solutions Technology", "Archs Solutions Tech.", "ARCHS SOLUTION TECHNOLOGIES Pvt Ltd", "Archs Solutions Techn"],
+    ["Tata Consultancy Services", "Tata Consultancy Services Limited", "TATA Consultancy Svcs"],
+]
+DIFFERENT = [
+    # Share the first word (same block); only the final word may be a truncation
+    ["Tata Consultancy Services", "Tata Consumer Products", "Tata Con Services", "Tata Steel"],
+    # A truncation that fits two known companies
+    ["Tata Consultancy", "Tata Consumer", "Tata Consu"],
+]
+
+
+async def fetch(name):
+    await asyncio.sleep(0.01)
+    return {"company_name": name}
+
+
+async def check():
+    failures = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        store = CompanyProfileStore(fetch, path=os.path.join(cache_dir, "companies.sqlite3"))
+        for names in SAME:
+            keys = {store.canonical_key(name) for name in names}
+            print(f"{names} -> {sorted(keys)}")
+            if len(keys) != 1:
+                failures.append(f"expected one company for {names}")
+        for i, names in enumerate(DIFFERENT):
+            store = CompanyProfileStore(fetch, path=os.path.join(cache_dir, f"different{i}.sqlite3"))
+            keys = [store.canonical_key(name) for name in names]
+            print(f"{names} -> {keys}")
+            if len(set(keys)) != len(names):
+                failures.append(f"expected distinct companies for {names}")
+        store = CompanyProfileStore(fetch, path=os.path.join(cache_dir, "fetches.sqlite3"))
+        profiles = await asyncio.gather(*(store.get_profile(name) for name in SAME[0] * 2))
+        if store.stats["fetches"] != 1 or len({profile["canonical_name"] for profile in profiles}) != 1:
+            failures.append(f"expected one fetch for {SAME[0]}, stats {store.stats}")
+    return failures
+
+
+def main():
+    failures = asyncio.run(check())
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK: variants share one profile, distinct companies stay apart")
+
+
+if __name__ == "__main__":
+    main()
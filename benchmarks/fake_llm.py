@@ -0,0 +1,66 @@
+"""Local stand-in for the Gemini/LangChain LLM used by the benchmarks."""
+import json
+import random
+import time
+
+
+class FakeLLM:
+    """
+    Blocking fake with the conversation.run(prompt) interface (the
+    StatelessLLM cache options bypass/accept are accepted and ignored).
+
+    Sleeps `latency` seconds (plus up to `jitter`) per call and answers with
+    a canned JSON payload chosen from the prompt, so the cleaning code can run
+    end to end without network access.
+    """
+
+    # Tools the fake "recognizes" in a description
+    TOOLS = ["React", "Angular", "Node", "JavaScript", "HTML", "CSS", "MongoDB", "Python", "AWS", "Docker"]
+    SOFT_SKILLS = ["collaborat", "lead", "communicat", "plan", "customer"]
+
+    def __init__(self, latency=0.5, jitter=0.0, seed=0, drop_rate=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.calls = 0
+        self.prompts = []
+        self._random = random.Random(seed)
+
+    def run(self, prompt, bypass=False, accept=None):
+        self.calls += 1
+        self.prompts.append(prompt)
+        time.sleep(self.latency + self._random.uniform(0, self.jitter))
+        return self.respond(prompt)
+
+    __call__ = run
+
+    def invoke(self, prompt):
+        return self.run(prompt if isinstance(prompt, str) else str(prompt))
+
+    def extract(self, description):
+        """Deterministic tools / soft skills for one description"""
+        lowered = description.lower()
+        return {
+            "tools_used/skill_used": [tool for tool in self.TOOLS if tool.lower() in lowered],
+            "Soft_skills": [skill for skill in self.SOFT_SKILLS if skill in lowered],
+        }
+
+    def respond(self, prompt):
+        if "Descriptions (JSON array" in prompt:
+            # Batched extraction: answer per item, dropping some to exercise retries
+            start = prompt.index("[", prompt.index("Descriptions (JSON array"))
+            end = prompt.index("Output a JSON array")
+            items = json.loads(prompt[start:end].strip())
+            return json.dumps([
+                {"id": item["id"], **self.extract(item["description"])}
+                for item in items if self._random.random() >= self.drop_rate
+            ])
+        if "Description:" in prompt and "Output in JSON" in prompt:
+            description = prompt.split("Description:", 1)[1].split("Output in JSON", 1)[0].strip()
+            return json.dumps(self.extract(description))
+        if "educational information" in prompt:
+            return json.dumps([{"degree": "MSc", "specialization": "Computer Science",
+                                "institution": "University of Ilorin", "year": "2016"}])
+        if "current job title" in prompt:
+            return "Software Engineer"
+        return json.dumps({"tools_used/skill_used": [], "Soft_skills": []})
@@ -0,0 +1,94 @@
+"""In-memory stand-in for the few pymongo collection methods the workers use."""
+import copy
+import itertools
+import threading
+
+
+def _matches(document, query):
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(_matches(document, sub_query) for sub_query in condition):
+                return False
+            continue
+        value = document.get(key)
+        if isinstance(condition, dict):
+            for operator, operand in condition.items():
+                if operator == "$gt" and not (value is not None and value > operand):
+                    return False
+                if operator == "$in" and value not in operand:
+                    return False
+        elif value != condition:
+            return False
+    return True
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self._documents = documents
+
+    def sort(self, keys):
+        for key, direction in reversed(keys):
+            self._documents.sort(key=lambda d: (d.get(key) is not None, d.get(key)), reverse=direction < 0)
+        return self
+
+    def limit(self, n):
+        self._documents = self._documents[:n] if n else self._documents
+        return self
+
+    def batch_size(self, n):
+        return self
+
+    def __iter__(self):
+        return iter(self._documents)
+
+
+class FakeCollection:
+    """
+    Thread-safe list of documents with find/find_one/insert/update/replace.
+
+    watch() raises like a standalone mongod does, so workers fall back to
+    polling.
+    """
+
+    def __init__(self, documents=()):
+        self._documents = [copy.deepcopy(d) for d in documents]
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.reads = 0
+
+    def find(self, query=None, *args, **kwargs):
+        with self._lock:
+            self.reads += 1
+            return FakeCursor([copy.deepcopy(d) for d in self._documents if _matches(d, query or {})])
+
+    def find_one(self, query=None, *args, **kwargs):
+        return next(iter(self.find(query)), None)
+
+    def insert_one(self, document):
+        with self._lock:
+            document = copy.deepcopy(document)
+            document.setdefault("_id", next(self._ids))
+            self._documents.append(document)
+            return document["_id"]
+
+    def update_one(self, query, update):
+        with self._lock:
+            for document in self._documents:
+                if _matches(document, query):
+                    document.update(copy.deepcopy(update.get("$set", {})))
+                    return
+
+    def replace_one(self, query, replacement, upsert=False):
+        with self._lock:
+            for i, document in enumerate(self._documents):
+                if _matches(document, query):
+                    self._documents[i] = {**copy.deepcopy(replacement), "_id": document["_id"]}
+                    return
+            if upsert:
+                self._documents.append({**copy.deepcopy(replacement), "_id": next(self._ids)})
+
+    def watch(self, *args, **kwargs):
+        raise NotImplementedError("change streams are only available on replica sets")
+
+    def __len__(self):
+        return len(self._documents)
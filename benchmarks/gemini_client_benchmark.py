@@ -0,0 +1,101 @@
+"""AsyncGeminiClient against a local fake Gemini server that injects 429s and delays.
+
+Usage: python benchmarks/gemini_client_benchmark.py --requests 100 --fail-rate 0.3
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "models"))
+from gemini_client import AsyncGeminiClient
+
+
+def start_fake_server(latency, fail_rate, seed=0):
+    """Fake generate endpoint: sleeps `latency`, answers 429 with probability fail_rate"""
+    rng = random.Random(seed)
+    lock = threading.Lock()
+    counts = {"requests": 0, "throttled": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            prompt = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["prompt"]
+            with lock:
+                counts["requests"] += 1
+                throttle = rng.random() < fail_rate
+                counts["throttled"] += throttle
+            time.sleep(latency)
+            if throttle:
+                self.send_response(429)
+                self.end_headers()
+                return
+            body = json.dumps({"text": json.dumps({"company_name": prompt})}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, counts
+
+
+def http_generate(url):
+    """Async prompt -> text callable talking to the fake server (HTTPError carries .code)"""
+    def post(prompt):
+        request = urllib.request.Request(url, data=json.dumps({"prompt": prompt}).encode(), method="POST")
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return json.loads(response.read())["text"]
+
+    async def generate(prompt):
+        return await asyncio.get_running_loop().run_in_executor(None, post, prompt)
+    return generate
+
+
+async def run(client, requests):
+    results = await asyncio.gather(
+        *(client.generate(f"Company {i}") for i in range(requests)), return_exceptions=True
+    )
+    return sum(1 for result in results if isinstance(result, Exception))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--fail-rate", type=float, default=0.3)
+    parser.add_argument("--rpm", type=float, default=1200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    server, counts = start_fake_server(args.latency, args.fail_rate)
+    url = f"http://127.0.0.1:{server.server_address[1]}/generate"
+    client = AsyncGeminiClient(
+        generate=http_generate(url), requests_per_minute=args.rpm,
+        max_concurrency=args.concurrency, base_delay=0.05, max_delay=1.0
+    )
+
+    start = time.perf_counter()
+    failures = asyncio.run(run(client, args.requests))
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    print(f"server: {counts['requests']} requests, {counts['throttled']} answered 429")
+    print(f"client: {client.metrics}, {failures} gave up")
+    summary = client.latency_summary()
+    print(f"latency: p50 {summary['p50'] * 1000:.0f} ms, p95 {summary['p95'] * 1000:.0f} ms, max {summary['max'] * 1000:.0f} ms")
+    print(f"throughput: {args.requests / elapsed:.1f} requests/s (limit {args.rpm / 60:.1f}/s)")
+
+
+if __name__ == "__main__":
+    main()
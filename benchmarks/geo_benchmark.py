@@ -0,0 +1,63 @@
+"""Radius search: per-pair distance loop vs GeoIndex.
+
+Usage: python benchmarks/geo_benchmark.py --candidates 1000000 --radius 50
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from geo_index import GeoIndex, haversine_km
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=1000000)
+    parser.add_argument("--employers", type=int, default=20)
+    parser.add_argument("--radius", type=float, default=50.0)
+    parser.add_argument("--loop-sample", type=int, default=20000,
+                        help="candidates timed with the per-pair loop (extrapolated)")
+    args = parser.parse_args()
+
+    # Candidates spread over India, where most of the data comes from
+    rng = np.random.default_rng(0)
+    latitude = rng.uniform(8, 35, args.candidates)
+    longitude = rng.uniform(68, 97, args.candidates)
+    employers = np.column_stack([rng.uniform(8, 35, args.employers), rng.uniform(68, 97, args.employers)])
+
+    try:
+        from geopy.distance import geodesic
+        pair_distance = lambda a, b: geodesic(a, b).kilometers
+        loop_name = "geodesic loop"
+    except ImportError:
+        pair_distance = lambda a, b: float(haversine_km(a[0], a[1], b[0], b[1]))
+        loop_name = "haversine loop"
+
+    sample = min(args.loop_sample, args.candidates)
+    start = time.perf_counter()
+    employer = tuple(employers[0])
+    for i in range(sample):
+        pair_distance(employer, (latitude[i], longitude[i]))
+    loop_ms = (time.perf_counter() - start) * 1000 * args.candidates / sample
+    print(f"{loop_name}: ~{loop_ms:.0f} ms per employer (extrapolated from {sample} pairs)")
+
+    start = time.perf_counter()
+    index = GeoIndex.from_dict(dict(enumerate(zip(latitude, longitude))))
+    index.within(*employers[0], args.radius)
+    print(f"GeoIndex built in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    start = time.perf_counter()
+    found = [index.within(lat, lon, args.radius) for lat, lon in employers]
+    query_ms = (time.perf_counter() - start) * 1000 / args.employers
+    print(f"GeoIndex radius query: {query_ms:.2f} ms per employer "
+          f"({np.mean([len(f) for f in found]):.0f} candidates within {args.radius:g} km)")
+
+    start = time.perf_counter()
+    matrix = index.distance_matrix(employers)
+    print(f"Distance matrix {matrix.shape}: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Ingestion worker against the in-memory Mongo stand-in.
+
+Backfills existing resumes, picks up new uploads and updates while running,
+checks that every latest version ends up in the output collection and
+reports the upload-to-written latency. Also checks shutdown: an update
+arriving while its document is being processed is still written, and a
+worker restarted from the watermark of one stopped mid-backlog picks up
+everything left unprocessed. Exits non-zero on mismatch.
+Usage: python benchmarks/ingest_worker_check.py --resumes 200 --uploads 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "models"))
+sys.path.insert(0, HERE)
+from fake_mongo import FakeCollection
+from ingest_worker import IngestWorker
+
+
+def make_process(latency, calls):
+    async def process(document, previous):
+        calls.append(document["_id"])
+        if previous and previous.get("version") == document["version"]:
+            return {**previous, "stage_timings": {"cleaned": {"status": "reused"}}}
+        await asyncio.sleep(latency)
+        return {"version": document["version"], "stage_timings": {"cleaned": {"status": "ok"}}}
+    return process
+
+
+async def run(args):
+    resumes = FakeCollection([{"_id": i, "version": 0, "updatedAt": 0.0} for i in range(args.resumes)])
+    output = FakeCollection()
+    calls = []
+    worker = IngestWorker(resumes, output, process=make_process(args.latency, calls), mode="auto",
+                          queue_size=args.queue_size, concurrency=args.concurrency, poll_interval=0.05)
+    task = asyncio.ensure_future(worker.run())
+
+    # New uploads and repeated edits while the worker is running
+    for i in range(args.uploads):
+        await asyncio.sleep(0.01)
+        now = time.time()
+        resumes.insert_one({"_id": args.resumes + i, "version": 0, "updatedAt": now})
+        resumes.update_one({"_id": i % 10}, {"$set": {"version": i + 1, "updatedAt": now}})
+
+    expected = {d["_id"]: d["version"] for d in resumes.find()}
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        written = {d["resume_id"]: d["version"] for d in output.find()}
+        if written == expected:
+            break
+        await asyncio.sleep(0.05)
+    worker.stop()
+    stats = await task
+    return stats, worker.latencies, written == expected, len(calls)
+
+
+async def shutdown(args):
+    # An update lands while the previous version is running, then stop() right away
+    resumes = FakeCollection([{"_id": 0, "version": 0, "updatedAt": 0.0}])
+    output = FakeCollection()
+    worker = IngestWorker(resumes, output, process=make_process(0.2, []), mode="poll", poll_interval=0.05)
+    task = asyncio.ensure_future(worker.run())
+    while not worker._in_flight:
+        await asyncio.sleep(0.01)
+    resumes.update_one({"_id": 0}, {"$set": {"version": 1, "updatedAt": 1.0}})
+    await asyncio.sleep(0.1)
+    worker.stop()
+    await task
+    newest_written = output.find_one({"resume_id": 0})["version"] == 1
+
+    # Stop with most of the backlog unprocessed, then resume from the watermark
+    resumes = FakeCollection([{"_id": i, "version": 0, "updatedAt": float(i // 3)} for i in range(args.resumes)])
+    output = FakeCollection()
+    calls = []
+    worker = IngestWorker(resumes, output, process=make_process(args.latency, calls), mode="poll",
+                          queue_size=args.queue_size, concurrency=2, drain_timeout=0.05, poll_interval=0.05)
+    task = asyncio.ensure_future(worker.run())
+    while len(calls) < 5:
+        await asyncio.sleep(0.01)
+    worker.stop()
+    await task
+    first_run = len(list(output.find()))
+    restarted = IngestWorker(resumes, output, process=make_process(args.latency, calls), mode="poll",
+                             concurrency=args.concurrency, poll_interval=0.05, since=worker.watermark)
+    task = asyncio.ensure_future(restarted.run())
+    deadline = time.time() + 30
+    while len(list(output.find())) < args.resumes and time.time() < deadline:
+        await asyncio.sleep(0.05)
+    restarted.stop()
+    await task
+    return newest_written, first_run, len(list(output.find())) == args.resumes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--uploads", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated pipeline time per resume")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--queue-size", type=int, default=20)
+    args = parser.parse_args()
+
+    stats, latencies, ok, calls = asyncio.run(run(args))
+    latencies = sorted(latencies)
+    print(f"stats: {stats}, pipeline runs: {calls}")
+    if latencies:
+        print(f"upload -> written latency: p50 {latencies[len(latencies) // 2]:.2f}s, max {latencies[-1]:.2f}s")
+    if not ok:
+        print("FAIL: output does not match the latest resume versions")
+        sys.exit(1)
+    print("OK: every latest version was written")
+
+    newest_written, first_run, resumed = asyncio.run(shutdown(args))
+    if not newest_written:
+        print("FAIL: an update that arrived during processing was lost at shutdown")
+        sys.exit(1)
+    if not resumed:
+        print("FAIL: restarting from the watermark skipped resumes that were still queued")
+        sys.exit(1)
+    print(f"OK: stopped after {first_run}/{args.resumes} resumes, restart from the watermark wrote the rest")
+
+
+if __name__ == "__main__":
+    main()
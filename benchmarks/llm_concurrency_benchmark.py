@@ -0,0 +1,71 @@
+"""Wall-clock time of per-position LLM extraction, sequential vs concurrent.
+
+Uses benchmarks/fake_llm.FakeLLM, so no API key or network is needed.
+Also runs calls that time out on a slow backend followed by fast ones, and
+exits non-zero if the fast calls time out behind the abandoned threads.
+Usage: python benchmarks/llm_concurrency_benchmark.py --positions 12 --latency 0.5
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "models"))
+sys.path.insert(0, HERE)
+import cleaned
+import clients
+from fake_llm import FakeLLM
+from llm_runner import AsyncLLMRunner
+
+
+def positions(n):
+    return [
+        {"JobTitle": f"Developer {i}", "Description": f"Built feature {i} with React and Node."}
+        for i in range(n)
+    ]
+
+
+async def timed(runner, llm, n):
+    clients._handles["llm_runner"] = runner
+    start = time.perf_counter()
+    # Single-item extractions fanned out with gather (the batched path makes one call)
+    await asyncio.gather(*(cleaned.run_llm_extraction(llm, job["Description"]) for job in positions(n)))
+    return time.perf_counter() - start
+
+
+async def after_timeouts(concurrency, slow, fast, timeout):
+    """Timed-out slow calls, then fast calls; returns how many fast calls failed"""
+    runner = AsyncLLMRunner(lambda latency: time.sleep(latency) or "ok", max_concurrency=concurrency, timeout=timeout)
+    await runner.gather([slow] * concurrency)
+    results = await runner.gather([fast] * (2 * concurrency))
+    return sum(1 for result in results if isinstance(result, Exception))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--positions", type=int, default=12)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    llm = FakeLLM(latency=args.latency)
+    sequential = asyncio.run(timed(AsyncLLMRunner(max_concurrency=1), llm, args.positions))
+    concurrent = asyncio.run(timed(AsyncLLMRunner(max_concurrency=args.concurrency), llm, args.positions))
+
+    print(f"{args.positions} positions, {args.latency}s per LLM call")
+    print(f"sequential (concurrency=1): {sequential:.2f}s")
+    print(f"concurrent (concurrency={args.concurrency}): {concurrent:.2f}s")
+    print(f"speedup: {sequential / concurrent:.1f}x")
+
+    timeout = 2 * args.latency
+    failed = asyncio.run(after_timeouts(args.concurrency, 4 * timeout, args.latency / 5, timeout))
+    print(f"fast calls timed out after {args.concurrency} slow timeouts: {failed}/{2 * args.concurrency}")
+    if failed:
+        print("FAIL: timed-out calls still hold pool threads the semaphore handed out again")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
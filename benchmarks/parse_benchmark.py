@@ -0,0 +1,69 @@
+"""Per-resume CPU time and peak memory: repeated json.loads vs ParsedResume.
+
+"before" repeats what the cleaning steps used to do with resumeParseData
+(decode in process_single_resume, again for skills, again plus an indented
+re-dump for education, once more for projects); "after" decodes once into
+a ParsedResume and reads its memoized views.
+Usage: python benchmarks/parse_benchmark.py --iterations 200
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "models"))
+import parsed_resume
+from parsed_resume import ParsedResume
+
+
+def before(text):
+    data = json.loads(text)
+    data.get("ContactInformation", {})
+    data.get("LanguageCompetencies", [])
+    data.get("EmploymentHistory", {}).get("Positions", [])
+    skills_data = json.loads(text).get("SkillsData", [])
+    pretty = json.dumps(json.loads(text or "{}"), indent=2)
+    projects = json.loads(text).get("Projects", [])
+    return skills_data, pretty, projects
+
+
+def after(text):
+    resume = ParsedResume(text)
+    resume.contact_info
+    resume.languages
+    resume.positions
+    return resume.skills, resume.pretty_text, resume.projects
+
+
+def measure(fn, text, iterations):
+    start = time.process_time()
+    for _ in range(iterations):
+        fn(text)
+    cpu_ms = (time.process_time() - start) * 1000 / iterations
+
+    tracemalloc.start()
+    fn(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu_ms, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    with open(os.path.join(HERE, "..", "Resume_parsed.json")) as f:
+        text = json.load(f)["resumeParseData"]
+    backend = "orjson" if parsed_resume.orjson is not None else "json"
+    print(f"resumeParseData: {len(text) / 1024:.0f} KiB, ParsedResume backend: {backend}")
+    for name, fn in (("before", before), ("after", after)):
+        cpu_ms, peak_kib = measure(fn, text, args.iterations)
+        print(f"{name:>6}: {cpu_ms:.2f} ms CPU per resume, peak {peak_kib:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Prompt size over many sequential resumes with the stateless extraction LLM.
+
+Runs process_single_resume over the same sample resume N times against
+benchmarks/fake_llm.FakeLLM and checks that per-call prompt token counts
+stay flat (no history is carried between resumes). Exits non-zero if not.
+Usage: python benchmarks/prompt_size_benchmark.py --resumes 1000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "models"))
+sys.path.insert(0, HERE)
+import cleaned
+import clients
+from fake_llm import FakeLLM
+from llm_runner import StatelessLLM
+
+
+async def run(resumes, data):
+    for _ in range(resumes):
+        await cleaned.process_single_resume(dict(data))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=1000)
+    args = parser.parse_args()
+
+    with open(os.path.join(HERE, "..", "Resume_parsed.json")) as f:
+        data = json.load(f)
+
+    llm = StatelessLLM(llm=FakeLLM(latency=0), history=None)
+    clients._handles["extraction_llm"] = llm
+    asyncio.run(run(args.resumes, data))
+
+    calls_per_resume = llm.totals["calls"] // args.resumes
+    first = [u["prompt_tokens"] for u in list(llm.usage)[:calls_per_resume]]
+    last = [u["prompt_tokens"] for u in list(llm.usage)[-calls_per_resume:]]
+    print(f"{args.resumes} resumes, {llm.totals['calls']} LLM calls, {llm.totals['prompt_tokens']} prompt tokens")
+    print(f"prompt tokens per call, first resume: {sorted(first)}")
+    print(f"prompt tokens per call, last resume:  {sorted(last)}")
+    if sorted(first) != sorted(last):
+        print("FAIL: prompt size grew between the first and last resume")
+        sys.exit(1)
+    print("OK: prompt size is flat")
+
+
+if __name__ == "__main__":
+    main()
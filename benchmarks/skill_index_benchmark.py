@@ -0,0 +1,57 @@
+"""Skills match for a whole pool: substring loop vs SkillIndex.
+
+Usage: python benchmarks/skill_index_benchmark.py --candidates 1000000
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from skill_index import SkillIndex
+
+BASE_SKILLS = ["react", "reactjs", "react native", "node.js", "node", "javascript", "typescript", "html", "css",
+               "mongodb", "python", "java", "docker", "kubernetes", "aws", "sql", "postgresql", "django",
+               "flask", "spring boot", "angular", "vue.js", "redux", "graphql", "git", "linux"]
+
+
+def loop_counts(candidates, required_skills):
+    """The per-candidate logic of _calculate_skills_match"""
+    counts = []
+    for skills in candidates:
+        candidate_skills = set(s.lower() for s in skills)
+        counts.append(sum(1 for skill in required_skills if any(skill in c_skill for c_skill in candidate_skills)))
+    return np.array(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=200000)
+    parser.add_argument("--vocab", type=int, default=5000, help="distinct skills, incl. noisy variants")
+    parser.add_argument("--required", type=int, default=6)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vocab = BASE_SKILLS + [f"{rng.choice(BASE_SKILLS)} {i}" for i in range(args.vocab - len(BASE_SKILLS))]
+    weights = 1.0 / np.arange(1, len(vocab) + 1)
+    weights /= weights.sum()
+    candidates = [list(rng.choice(vocab, rng.integers(0, 15), p=weights)) for _ in range(args.candidates)]
+    required = set(rng.choice(BASE_SKILLS, args.required, replace=False))
+
+    start = time.perf_counter()
+    expected = loop_counts(candidates, required)
+    print(f"Substring loop: {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    index = SkillIndex(candidates)
+    print(f"SkillIndex built in {time.perf_counter() - start:.2f}s ({len(index.vocab)} skills)")
+
+    start = time.perf_counter()
+    counts = index.match_counts(required)
+    print(f"SkillIndex match: {(time.perf_counter() - start) * 1000:.1f} ms per job")
+    assert (counts == expected).all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Skill matching through the taxonomy on alias-form skills.
+
+Checks that a job and a candidate listing the same skills in alias form
+("AWS", "JS", "Node") match fully, in the per-candidate and the batch
+scorer and with canonical names on either side, that skills the taxonomy
+does not know ("Go", "Kafka") still match as text, and that ordinary prose
+does not produce skills. Exits non-zero on mismatch.
+Usage: python benchmarks/skill_taxonomy_check.py
+"""
+import json
+import os
+import sys
+from importlib.machinery import SourceFileLoader
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+from skill_taxonomy import SkillTaxonomy, SKILL_SYNONYMS_PATH
+
+CandidateMatching = SourceFileLoader("CandidateMatching", os.path.join(ROOT, "CandidateMatching")).load_module()
+
+ALIASES = ["AWS", "JS", "Node"]
+CANONICAL = ["Amazon Web Services", "JavaScript", "Node.js"]
+
+
+def fail(message):
+    print(f"FAIL: {message}")
+    sys.exit(1)
+
+
+def main():
+    taxonomy = SkillTaxonomy()
+    with open(SKILL_SYNONYMS_PATH, encoding="utf-8") as f:
+        taxonomy.add_synonyms(json.load(f))
+    system = CandidateMatching.CandidateMatchingSystem(skill_taxonomy=taxonomy)
+
+    candidates = [
+        system.preprocess_candidate_data({"_id": {"$oid": f"c{i}"}, "devChooseSkills": skills})
+        for i, skills in enumerate([ALIASES, CANONICAL, ["AWS"]])
+    ]
+    expected = [1.0, 1.0, 1 / 3]
+    for required in (ALIASES, CANONICAL):
+        job = {"required_skills": required}
+        single = [system.match_candidate_to_job(candidate, job) for candidate in candidates]
+        batch = system.score_candidates_batch(job, candidates)
+        if single != batch:
+            fail(f"batch and per-candidate scores differ for {required}")
+        got = [result["detailed_scores"]["skills_match"] for result in single]
+        print(f"required {required}: skills_match {[round(score, 4) for score in got]}")
+        if got != expected:
+            fail(f"expected skills_match {expected}")
+
+    # Skills without ids in the taxonomy score as they do without a taxonomy
+    plain = CandidateMatching.CandidateMatchingSystem()
+    job = {"required_skills": ["Go", "Kafka", "AWS"]}
+    for source in ({"devChooseSkills": ["Go", "Kafka"]}, {"devChooseSkills": ["Golang", "Apache Kafka", "AWS"]}):
+        candidate = system.preprocess_candidate_data({"_id": {"$oid": "unknown"}, **source})
+        single = system.match_candidate_to_job(candidate, job)
+        if [single] != system.score_candidates_batch(job, [candidate]):
+            fail(f"batch and per-candidate scores differ for unknown skills {source}")
+        got = single["detailed_scores"]["skills_match"]
+        without = plain.match_candidate_to_job(plain.preprocess_candidate_data({"_id": {"$oid": "unknown"}, **source}), job)
+        print(f"required {job['required_skills']}, candidate {source['devChooseSkills']}: skills_match {round(got, 4)}")
+        if got != without["detailed_scores"]["skills_match"]:
+            fail(f"expected the score without a taxonomy, {without['detailed_scores']['skills_match']}")
+
+    prose = "Happy to express interest; the rest of the team reacts to nodes and dockers"
+    if taxonomy.match(prose):
+        fail(f"prose matched {taxonomy.skill_names(taxonomy.match(prose))}")
+    print("OK: alias-form skills match through the taxonomy, prose matches nothing")
+
+
+if __name__ == "__main__":
+    main()
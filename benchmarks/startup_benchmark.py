@@ -0,0 +1,96 @@
+"""Import time and first-request latency of each entry point.
+
+Every measurement runs in a fresh interpreter so imports are cold.
+Usage: python benchmarks/startup_benchmark.py --repeat 3
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import statistics
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+MODELS = os.path.join(ROOT, "models")
+
+# entry point -> (working directory, import statement, first request)
+ENTRY_POINTS = {
+    "CandidateMatching": (
+        ROOT,
+        "from importlib.machinery import SourceFileLoader\n"
+        "module = SourceFileLoader('CandidateMatching', 'CandidateMatching').load_module()",
+        "import json\n"
+        "candidate = json.load(open('Resume_parsed.json'))\n"
+        "module.CandidateMatchingSystem().preprocess_candidate_data(candidate)",
+    ),
+    "models/cleaned.py": (
+        MODELS,
+        "import cleaned as module",
+        "module.get_resume_collection().find_one()",
+    ),
+    "models/company.py": (
+        MODELS,
+        "import company as module",
+        "import asyncio\n"
+        "asyncio.run(module.extract_company_details('Archs Solutions Technology'))",
+    ),
+    "models/location.py": (
+        MODELS,
+        "import location as module",
+        "import asyncio\n"
+        "asyncio.run(module.get_coordinates('Churk', 'UP', 'India'))",
+    ),
+    "models/stability.py": (
+        MODELS,
+        "import stability as module",
+        "module.analyze_with_llm('Archs Solutions Technology: 35 months - Moderate tenure')",
+    ),
+}
+
+CHILD = """
+import json, time, traceback
+result = {{}}
+start = time.perf_counter()
+try:
+{import_code}
+    result["import_s"] = time.perf_counter() - start
+    start = time.perf_counter()
+{request_code}
+    result["first_request_s"] = time.perf_counter() - start
+except Exception:
+    result["error"] = traceback.format_exc().strip().splitlines()[-1]
+print("RESULT " + json.dumps(result))
+"""
+
+
+def indent(code):
+    return "\n".join("    " + line for line in code.splitlines())
+
+
+def run_once(cwd, import_code, request_code):
+    script = CHILD.format(import_code=indent(import_code), request_code=indent(request_code))
+    output = subprocess.run([sys.executable, "-c", script], cwd=cwd, capture_output=True, text=True).stdout
+    lines = [line for line in output.splitlines() if line.startswith("RESULT ")]
+    return json.loads(lines[-1][len("RESULT "):]) if lines else {"error": "no result"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", choices=list(ENTRY_POINTS), default=list(ENTRY_POINTS))
+    args = parser.parse_args()
+
+    print(f"{'entry point':<22}{'import ms':>12}{'first request ms':>18}")
+    for name in args.only:
+        cwd, import_code, request_code = ENTRY_POINTS[name]
+        runs = [run_once(cwd, import_code, request_code) for _ in range(args.repeat)]
+        errors = [run["error"] for run in runs if "error" in run]
+        imports = [run["import_s"] * 1000 for run in runs if "import_s" in run]
+        requests = [run["first_request_s"] * 1000 for run in runs if "first_request_s" in run]
+        import_ms = f"{statistics.median(imports):.1f}" if imports else "-"
+        request_ms = f"{statistics.median(requests):.1f}" if requests else "-"
+        print(f"{name:<22}{import_ms:>12}{request_ms:>18}" + (f"  ({errors[0]})" if errors else ""))
+
+
+if __name__ == "__main__":
+    main()
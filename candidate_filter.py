@@ -0,0 +1,150 @@
+from collections import namedtuple
+import numpy as np
+from geo_index import GeoIndex, coordinates_of
+
+# Candidates asking up to this much above the job's max salary stay in the pool
+SALARY_TOLERANCE = 0.25
+
+# Job types that do not need the candidate to be nearby
+REMOTE_JOB_TYPES = {'remote'}
+
+# The job fields the stages read, normalized the same way as CompiledJob
+JobFields = namedtuple('JobFields', 'location job_type coordinates max_distance_km max_salary')
+
+
+def job_fields(job_description, radius_km):
+    """JobFields from a job description dict, or from a CompiledJob's normalized attributes"""
+    if isinstance(job_description, dict):
+        return JobFields(
+            (job_description.get('location') or '').lower(),
+            (job_description.get('job_type') or '').lower(),
+            coordinates_of(job_description),
+            job_description.get('max_distance_km', radius_km),
+            job_description.get('max_salary', 0)
+        )
+    return JobFields(job_description.location, job_description.job_type, job_description.coordinates,
+                     job_description.max_distance_km, job_description.max_salary)
+
+
+class CandidatePrefilter:
+    """Candidate generation stage run before full scoring
+
+    Inverted indexes over preprocessed candidates (location string, job
+    preferences, salary band, plus a GeoIndex when candidates have
+    coordinates) cut the pool down to plausible candidates for a job:
+
+    - location: same location, or within max_distance_km of the job
+      (skipped for remote jobs)
+    - job_type: the job type is one of the candidate's preferences
+    - salary: expected salary at most max_salary * (1 + salary_tolerance)
+
+    Candidates with no data for a stage (no location, no preferences, no
+    expected salary) are kept by that stage rather than guessed away.
+    filter() reports how much of the pool each stage pruned.
+    """
+
+    def __init__(self, candidates, n_salary_bands=16, salary_tolerance=SALARY_TOLERANCE, radius_km=50):
+        self.candidates = list(candidates)
+        self.size = len(self.candidates)
+        self.salary_tolerance = salary_tolerance
+        self.radius_km = radius_km
+        self.candidate_ids = [c.get('candidate_id') for c in self.candidates]
+
+        self.location_postings, self.location_unknown = self._postings(
+            [[(c.get('location') or '').lower()] if c.get('location') else [] for c in self.candidates]
+        )
+        self.job_type_postings, self.job_type_unknown = self._postings(
+            [[p.lower() for p in c.get('job_preference', [])] for c in self.candidates]
+        )
+
+        coordinates = {i: c['coordinates'] for i, c in enumerate(self.candidates) if c.get('coordinates')}
+        self.geo_index = GeoIndex.from_dict(coordinates) if coordinates else None
+
+        # Salary bands: quantile edges, one posting list per band
+        self.expected_salary = np.array(
+            [float(c.get('expected_salary', 0)) if c.get('expected_salary', '') else 0.0 for c in self.candidates],
+            dtype=np.float64
+        )
+        known = self.expected_salary > 0
+        self.salary_unknown = np.flatnonzero(~known)
+        if known.any():
+            quantiles = np.linspace(0, 1, n_salary_bands + 1)[1:-1]
+            self.salary_edges = np.unique(np.quantile(self.expected_salary[known], quantiles))
+        else:
+            self.salary_edges = np.zeros(0)
+        band = np.searchsorted(self.salary_edges, self.expected_salary, side='right')
+        self.salary_postings = [np.flatnonzero(known & (band == b)) for b in range(len(self.salary_edges) + 1)]
+
+    @staticmethod
+    def _postings(values_per_candidate):
+        """{value: row indices} plus the rows that have no value at all"""
+        postings, unknown = {}, []
+        for i, values in enumerate(values_per_candidate):
+            if not values:
+                unknown.append(i)
+            for value in set(values):
+                postings.setdefault(value, []).append(i)
+        return ({value: np.array(rows, dtype=np.int64) for value, rows in postings.items()},
+                np.array(unknown, dtype=np.int64))
+
+    def _mask(self, *row_arrays):
+        mask = np.zeros(self.size, dtype=bool)
+        for rows in row_arrays:
+            mask[rows] = True
+        return mask
+
+    def _location_mask(self, job):
+        if job.job_type in REMOTE_JOB_TYPES or not (job.location or job.coordinates):
+            return None
+        mask = self._mask(self.location_unknown, self.location_postings.get(job.location, []))
+        if job.coordinates and self.geo_index is not None:
+            mask[[i for i, _ in self.geo_index.within(*job.coordinates, job.max_distance_km)]] = True
+        return mask
+
+    def _job_type_mask(self, job):
+        if not job.job_type:
+            return None
+        return self._mask(self.job_type_unknown, self.job_type_postings.get(job.job_type, []))
+
+    def _salary_mask(self, job):
+        job_max_salary = job.max_salary
+        if not job_max_salary:
+            return None
+        limit = job_max_salary * (1 + self.salary_tolerance)
+        # Whole bands below the limit, exact check only in the band containing it
+        last_band = int(np.searchsorted(self.salary_edges, limit, side='right'))
+        mask = self._mask(self.salary_unknown, *self.salary_postings[:last_band])
+        boundary = self.salary_postings[last_band]
+        mask[boundary[self.expected_salary[boundary] <= limit]] = True
+        return mask
+
+    def filter(self, job_description):
+        """Row indices of plausible candidates and a per-stage pruning report
+
+        job_description is a dict or a CompiledJob.
+        """
+        job = job_fields(job_description, self.radius_km)
+        keep = np.ones(self.size, dtype=bool)
+        report = []
+        for stage, build_mask in (('location', self._location_mask),
+                                  ('job_type', self._job_type_mask),
+                                  ('salary', self._salary_mask)):
+            before = int(keep.sum())
+            mask = build_mask(job)
+            if mask is not None:
+                keep &= mask
+            after = int(keep.sum())
+            report.append({
+                'stage': stage,
+                'applied': mask is not None,
+                'before': before,
+                'after': after,
+                'pruned': before - after,
+                'pruned_pct': round(100.0 * (before - after) / before, 1) if before else 0.0
+            })
+        return np.flatnonzero(keep), report
+
+    def plausible_candidates(self, job_description):
+        """Candidates (preprocessed dicts) that pass every stage, plus the report"""
+        rows, report = self.filter(job_description)
+        return [self.candidates[i] for i in rows], report
@@ -0,0 +1,278 @@
+import sys
+from array import array
+import numpy as np
+
+# preprocess_candidate_data keys by storage kind
+ID_FIELDS = ('candidate_id', 'name', 'email')
+CODED_FIELDS = ('location', 'highest_degree', 'salary_currency', 'salary_duration',
+                'current_salary', 'expected_salary')
+NUMBER_FIELDS = ('total_experience', 'avg_job_tenure')
+FLAG_FIELDS = ('has_leadership_exp', 'english_test_passed')
+LIST_FIELDS = ('job_preference', 'job_titles', 'companies', 'degrees', 'institutions', 'skills')
+KNOWN_FIELDS = set(ID_FIELDS + CODED_FIELDS + NUMBER_FIELDS + FLAG_FIELDS + LIST_FIELDS
+                   + ('coordinates', 'skill_ids', 'tech_test_results'))
+
+# Number kinds, so values come back with the type they went in with
+NONE, INT, FLOAT, OTHER = 0, 1, 2, 3
+
+
+class StringPool:
+    """Distinct values with dense integer codes; code -1 stands for None"""
+
+    __slots__ = ('codes', 'values')
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def __len__(self):
+        return len(self.values)
+
+    def code(self, value):
+        if value is None:
+            return -1
+        code = self.codes.get(value)
+        if code is None:
+            if isinstance(value, str):
+                value = sys.intern(value)
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def value(self, code):
+        return None if code < 0 else self.values[code]
+
+    def table(self, function, missing):
+        """function(value) for every code, with `missing` appended so index -1 maps to None's entry"""
+        return [function(value) for value in self.values] + [missing]
+
+
+class NumberColumn:
+    """Numbers as float64 scoring values (float(value or 0)) plus a one-byte type tag"""
+
+    __slots__ = ('scores', 'kinds', 'other')
+
+    def __init__(self):
+        self.scores = array('d')
+        self.kinds = array('b')
+        self.other = {}
+
+    def append(self, value):
+        if value is None:
+            self.kinds.append(NONE)
+        elif isinstance(value, int) and not isinstance(value, bool) and -2 ** 53 <= value <= 2 ** 53:
+            self.kinds.append(INT)
+        elif isinstance(value, float):
+            self.kinds.append(FLOAT)
+        else:
+            # Numeric strings, bools, Decimals...: keep the original object
+            self.other[len(self.kinds)] = value
+            self.kinds.append(OTHER)
+        try:
+            self.scores.append(float(value or 0))
+        except (TypeError, ValueError):
+            self.scores.append(np.nan)
+
+    def value(self, row):
+        kind = self.kinds[row]
+        if kind == NONE:
+            return None
+        if kind == INT:
+            return int(self.scores[row])
+        if kind == FLOAT:
+            return self.scores[row]
+        return self.other[row]
+
+
+class ListColumn:
+    """Variable-length lists of strings, flattened: offsets into one array of pool codes"""
+
+    __slots__ = ('pool', 'offsets', 'codes')
+
+    def __init__(self, pool=None):
+        self.pool = pool if pool is not None else StringPool()
+        self.offsets = array('q', [0])
+        self.codes = array('i')
+
+    def append(self, values):
+        self.codes.extend(self.pool.code(value) for value in values or [])
+        self.offsets.append(len(self.codes))
+
+    def row_codes(self, row):
+        return self.codes[self.offsets[row]:self.offsets[row + 1]]
+
+    def value(self, row):
+        return [self.pool.value(code) for code in self.row_codes(row)]
+
+    def owners(self):
+        """Row index of every flattened entry"""
+        offsets = np.frombuffer(self.offsets, dtype=np.int64).copy()
+        return np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+
+class CandidateStore:
+    """Struct-of-arrays store of preprocessed candidates
+
+    Holds what preprocess_candidate_data returns in typed columns instead
+    of one dict per candidate: repeated strings (location/region, degree,
+    currency, salary strings, titles, companies, institutions, skills,
+    job preferences, test names) are interned once in a StringPool and
+    stored as int32 codes, numbers as float64 with a type tag, flags as
+    bytes, and list fields flattened with offsets. Columns are growable
+    (append/extend).
+
+    to_dict(row) rebuilds the original dict (same keys, values and types)
+    for API responses, and CandidateFeatureMatrix builds its arrays
+    straight from the columns. memory_per_candidate() measures the
+    footprint.
+    """
+
+    def __init__(self, candidates=()):
+        self.size = 0
+        self.ids = {field: [] for field in ID_FIELDS}
+        self.coded = {field: (StringPool(), array('i')) for field in CODED_FIELDS}
+        self.numbers = {field: NumberColumn() for field in NUMBER_FIELDS}
+        self.flags = {field: array('b') for field in FLAG_FIELDS}
+        self.lists = {field: ListColumn() for field in LIST_FIELDS}
+        self.latitude = array('d')
+        self.longitude = array('d')
+        self.skill_ids = array('i')
+        self.skill_id_offsets = array('q', [0])
+        self.has_skill_ids = array('b')
+        self.tests = ListColumn()
+        self.test_scores = NumberColumn()
+        self.test_passed = array('b')
+        # Keys preprocess_candidate_data does not produce, per row (rare)
+        self.extras = {}
+        self.extend(candidates)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return (self.to_dict(row) for row in range(self.size))
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += self.size
+        if not 0 <= row < self.size:
+            raise IndexError(row)
+        return self.to_dict(row)
+
+    @property
+    def candidate_ids(self):
+        return self.ids['candidate_id']
+
+    @property
+    def names(self):
+        return self.ids['name']
+
+    def extend(self, candidates):
+        for candidate in candidates:
+            self.append(candidate)
+
+    def append(self, candidate):
+        """Add one preprocess_candidate_data dict"""
+        row = self.size
+        for field in ID_FIELDS:
+            value = candidate.get(field)
+            self.ids[field].append(sys.intern(value) if isinstance(value, str) else value)
+        for field in CODED_FIELDS:
+            pool, codes = self.coded[field]
+            codes.append(pool.code(candidate.get(field)))
+        for field in NUMBER_FIELDS:
+            self.numbers[field].append(candidate.get(field))
+        for field in FLAG_FIELDS:
+            self.flags[field].append(bool(candidate.get(field)))
+        for field in LIST_FIELDS:
+            self.lists[field].append(candidate.get(field))
+
+        latitude, longitude = candidate.get('coordinates') or (np.nan, np.nan)
+        self.latitude.append(latitude)
+        self.longitude.append(longitude)
+
+        skill_ids = candidate.get('skill_ids')
+        self.has_skill_ids.append(skill_ids is not None)
+        self.skill_ids.extend(skill_ids or [])
+        self.skill_id_offsets.append(len(self.skill_ids))
+
+        tests = candidate.get('tech_test_results') or []
+        self.tests.append(test.get('test_name') for test in tests)
+        for test in tests:
+            self.test_scores.append(test.get('score'))
+            self.test_passed.append(bool(test.get('passed')))
+
+        extras = {key: value for key, value in candidate.items() if key not in KNOWN_FIELDS}
+        if extras:
+            self.extras[row] = extras
+        self.size += 1
+
+    def coded_value(self, field, row):
+        pool, codes = self.coded[field]
+        return pool.value(codes[row])
+
+    def to_dict(self, row):
+        """The preprocess_candidate_data dict of one row"""
+        start, end = self.skill_id_offsets[row], self.skill_id_offsets[row + 1]
+        test_start, test_end = self.tests.offsets[row], self.tests.offsets[row + 1]
+        coordinates = (self.latitude[row], self.longitude[row])
+        data = {
+            'candidate_id': self.ids['candidate_id'][row],
+            'name': self.ids['name'][row],
+            'email': self.ids['email'][row],
+            'location': self.coded_value('location', row),
+            'coordinates': None if np.isnan(coordinates[0]) else coordinates,
+            'job_preference': self.lists['job_preference'].value(row),
+            'total_experience': self.numbers['total_experience'].value(row),
+            'avg_job_tenure': self.numbers['avg_job_tenure'].value(row),
+            'job_titles': self.lists['job_titles'].value(row),
+            'companies': self.lists['companies'].value(row),
+            'has_leadership_exp': bool(self.flags['has_leadership_exp'][row]),
+            'degrees': self.lists['degrees'].value(row),
+            'institutions': self.lists['institutions'].value(row),
+            'highest_degree': self.coded_value('highest_degree', row),
+        }
+        if self.has_skill_ids[row]:
+            data['skill_ids'] = list(self.skill_ids[start:end])
+        data['skills'] = self.lists['skills'].value(row)
+        data['tech_test_results'] = [
+            {
+                'test_name': self.tests.pool.value(self.tests.codes[i]),
+                'score': self.test_scores.value(i),
+                'passed': bool(self.test_passed[i])
+            }
+            for i in range(test_start, test_end)
+        ]
+        data['english_test_passed'] = bool(self.flags['english_test_passed'][row])
+        for field in ('current_salary', 'expected_salary', 'salary_currency', 'salary_duration'):
+            data[field] = self.coded_value(field, row)
+        data.update(self.extras.get(row, {}))
+        return data
+
+    def to_dicts(self):
+        return list(self)
+
+    def memory_per_candidate(self):
+        """Measured bytes per candidate (all columns, pools and interned strings)"""
+        return deep_sizeof(self) / self.size if self.size else 0.0
+
+
+def deep_sizeof(obj, seen=None):
+    """Bytes held by obj and everything it references (each object counted once)"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes + sys.getsizeof(np.empty(0))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += deep_sizeof(vars(obj), seen)
+    elif hasattr(obj, '__slots__'):
+        size += sum(deep_sizeof(getattr(obj, slot), seen) for slot in obj.__slots__ if hasattr(obj, slot))
+    return size
@@ -0,0 +1,125 @@
+import numpy as np
+from top_n import top_n_indices
+
+
+class EmbeddingStore:
+    """Candidate embeddings kept pre-normalized in one contiguous float32 matrix
+    
+    Rows are L2-normalized on insert, so cosine similarity against every
+    stored candidate is a single matrix-vector product, and a batch of job
+    embeddings is a single matrix-matrix product (GEMM).
+    """
+    
+    def __init__(self, dim=None, capacity=1024):
+        self.dim = dim
+        self.ids = []
+        self.id_index = {}
+        self._matrix = np.zeros((capacity, dim), dtype=np.float32) if dim else None
+    
+    @classmethod
+    def from_dict(cls, embeddings):
+        """Build a store from a {candidate_id: embedding} dict"""
+        store = cls()
+        store.add_many(embeddings.items())
+        return store
+    
+    def __len__(self):
+        return len(self.ids)
+    
+    def __contains__(self, candidate_id):
+        return candidate_id in self.id_index
+    
+    @property
+    def matrix(self):
+        """Normalized embeddings of all stored candidates (one row per id)"""
+        if self._matrix is None:
+            return np.zeros((0, 0), dtype=np.float32)
+        return self._matrix[:len(self.ids)]
+    
+    def add(self, candidate_id, embedding):
+        """Insert or replace the embedding of one candidate"""
+        self.add_many([(candidate_id, embedding)])
+    
+    def add_many(self, items):
+        """Insert or replace embeddings from (candidate_id, embedding) pairs"""
+        items = list(items)
+        if not items:
+            return
+        vectors = _normalize(np.asarray([embedding for _, embedding in items], dtype=np.float32))
+        
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            self._matrix = np.zeros((max(1024, len(items)), self.dim), dtype=np.float32)
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected embeddings of size {self.dim}, got {vectors.shape[1]}")
+        
+        new_rows = sum(1 for candidate_id, _ in items if candidate_id not in self.id_index)
+        self._reserve(len(self.ids) + new_rows)
+        
+        for (candidate_id, _), vector in zip(items, vectors):
+            row = self.id_index.get(candidate_id)
+            if row is None:
+                row = len(self.ids)
+                self.id_index[candidate_id] = row
+                self.ids.append(candidate_id)
+            self._matrix[row] = vector
+    
+    def remove(self, candidate_id):
+        """Remove a candidate; the last row is moved into its slot"""
+        row = self.id_index.pop(candidate_id)
+        last = len(self.ids) - 1
+        if row != last:
+            moved_id = self.ids[last]
+            self._matrix[row] = self._matrix[last]
+            self.ids[row] = moved_id
+            self.id_index[moved_id] = row
+        self.ids.pop()
+    
+    def get(self, candidate_id):
+        """Return the normalized embedding of a candidate"""
+        return self._matrix[self.id_index[candidate_id]]
+    
+    def similarities(self, job_embedding):
+        """Cosine similarity of one job embedding against every stored candidate"""
+        if not self.ids:
+            return np.zeros(0, dtype=np.float32)
+        query = _normalize(np.asarray(job_embedding, dtype=np.float32).reshape(1, -1))[0]
+        return self.matrix @ query
+    
+    def similarities_batch(self, job_embeddings):
+        """Cosine similarities of many job embeddings, shape (n_jobs, n_candidates)"""
+        queries = _normalize(np.atleast_2d(np.asarray(job_embeddings, dtype=np.float32)))
+        if not self.ids:
+            return np.zeros((len(queries), 0), dtype=np.float32)
+        return queries @ self.matrix.T
+    
+    def query(self, job_embedding, top_n=20):
+        """Return the top_n most similar candidate ids with their similarity"""
+        scores = self.similarities(job_embedding)
+        return [(self.ids[i], float(scores[i])) for i in top_n_indices(scores, top_n)]
+    
+    def query_batch(self, job_embeddings, top_n=20):
+        """Run query for many job embeddings with a single GEMM"""
+        scores = self.similarities_batch(job_embeddings)
+        return [
+            [(self.ids[i], float(row[i])) for i in top_n_indices(row, top_n)]
+            for row in scores
+        ]
+    
+    def _reserve(self, size):
+        """Grow the backing matrix (doubling) so it can hold size rows"""
+        capacity = self._matrix.shape[0]
+        if size <= capacity:
+            return
+        # max(): doubling alone never grows a capacity=0 store
+        capacity = max(size, 2 * capacity)
+        grown = np.zeros((capacity, self.dim), dtype=np.float32)
+        grown[:len(self.ids)] = self._matrix[:len(self.ids)]
+        self._matrix = grown
+
+
+def _normalize(vectors):
+    """L2-normalize rows, leaving all-zero rows as zeros (like sklearn)"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
@@ -0,0 +1,121 @@
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km; broadcasts over NumPy arrays"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def coordinates_of(data):
+    """(latitude, longitude) from a dict with latitude/longitude keys, directly
+    or under 'coordinates' / 'location'; None when missing"""
+    if not isinstance(data, dict):
+        return None
+    for source in (data, data.get('coordinates'), data.get('location')):
+        if isinstance(source, dict) and source.get('latitude') is not None and source.get('longitude') is not None:
+            try:
+                return float(source['latitude']), float(source['longitude'])
+            except (TypeError, ValueError):
+                return None
+    return None
+
+
+class GeoIndex:
+    """Radius search over candidate coordinates (fixed lat/lon grid)
+
+    Points are bucketed into cell_deg x cell_deg cells and kept sorted by
+    cell id, so each row of cells a query touches is one contiguous slice.
+    A radius query only computes exact haversine distances for the points
+    in the cells overlapping the query's bounding box.
+    """
+
+    def __init__(self, cell_deg=0.5):
+        self.cell_deg = cell_deg
+        self.n_lat = int(np.ceil(180 / cell_deg))
+        self.n_lon = int(np.ceil(360 / cell_deg))
+        self.ids = []
+        self.latitude = np.zeros(0)
+        self.longitude = np.zeros(0)
+        self._order = None
+        self._cells = None
+
+    @classmethod
+    def from_dict(cls, coordinates, **kwargs):
+        """Build an index from a {candidate_id: (latitude, longitude)} dict"""
+        index = cls(**kwargs)
+        index.add_many(coordinates.items())
+        return index
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add_many(self, items):
+        """Add (candidate_id, (latitude, longitude)) pairs"""
+        items = list(items)
+        if not items:
+            return
+        self.ids.extend(candidate_id for candidate_id, _ in items)
+        points = np.array([point for _, point in items], dtype=np.float64).reshape(-1, 2)
+        self.latitude = np.concatenate([self.latitude, points[:, 0]])
+        self.longitude = np.concatenate([self.longitude, points[:, 1]])
+        self._order = None
+
+    def _cell_ids(self, latitude, longitude):
+        lat_bin = np.clip(((latitude + 90) // self.cell_deg).astype(np.int64), 0, self.n_lat - 1)
+        lon_bin = ((longitude + 180) // self.cell_deg).astype(np.int64) % self.n_lon
+        return lat_bin * self.n_lon + lon_bin
+
+    def _build(self):
+        cells = self._cell_ids(self.latitude, self.longitude)
+        self._order = np.argsort(cells, kind='stable')
+        self._cells = cells[self._order]
+
+    def _candidate_rows(self, latitude, longitude, radius_km):
+        """Indexes of points in the cells overlapping the query bounding box"""
+        if self._order is None:
+            self._build()
+        dlat = np.degrees(radius_km / EARTH_RADIUS_KM)
+        lat_lo, lat_hi = latitude - dlat, latitude + dlat
+        lat_bins = range(max(0, int((lat_lo + 90) // self.cell_deg)),
+                         min(self.n_lat - 1, int((lat_hi + 90) // self.cell_deg)) + 1)
+
+        max_cos = np.cos(np.radians(min(90.0, max(abs(lat_lo), abs(lat_hi)))))
+        if lat_lo <= -90 or lat_hi >= 90 or max_cos < 1e-9 or dlat / max_cos >= 180:
+            lon_ranges = [(0, self.n_lon - 1)]
+        else:
+            dlon = dlat / max_cos
+            lo = int((longitude - dlon + 180) // self.cell_deg) % self.n_lon
+            hi = int((longitude + dlon + 180) // self.cell_deg) % self.n_lon
+            # Split at the antimeridian
+            lon_ranges = [(lo, hi)] if lo <= hi else [(lo, self.n_lon - 1), (0, hi)]
+
+        starts, ends = [], []
+        for lat_bin in lat_bins:
+            for lo, hi in lon_ranges:
+                starts.append(lat_bin * self.n_lon + lo)
+                ends.append(lat_bin * self.n_lon + hi + 1)
+        starts = np.searchsorted(self._cells, starts, side='left')
+        ends = np.searchsorted(self._cells, ends, side='left')
+        if not len(starts):
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate([self._order[s:e] for s, e in zip(starts, ends)])
+
+    def within(self, latitude, longitude, radius_km):
+        """[(candidate_id, distance_km)] within radius_km, nearest first"""
+        if not self.ids:
+            return []
+        rows = self._candidate_rows(latitude, longitude, radius_km)
+        distances = haversine_km(latitude, longitude, self.latitude[rows], self.longitude[rows])
+        keep = distances <= radius_km
+        rows, distances = rows[keep], distances[keep]
+        order = np.lexsort((rows, distances))
+        return [(self.ids[rows[i]], float(distances[i])) for i in order]
+
+    def distance_matrix(self, points):
+        """(n_points, n_candidates) km matrix for [(latitude, longitude)] points, e.g. employers"""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        return haversine_km(points[:, :1], points[:, 1:], self.latitude[None, :], self.longitude[None, :])
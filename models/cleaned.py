@@ -1,30 +1,19 @@
-from langchain_google_genai import GoogleGenerativeAI
-from langchain.chains import ConversationChain
-from langchain.memory import ConversationBufferMemory
-from langchain.prompts import PromptTemplate
-from dotenv import load_dotenv
-import os
-from pymongo import MongoClient
 import asyncio
+import os
+import sys
 import time
 import json
 import re
-load_dotenv()
-
-# Set up Gemini API key and model
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-GEMINI_MODEL = os.getenv("GEMINI_MODEL")
+from functools import partial
+# MongoDB collections and the LangChain model are created on first use
+from clients import get_resume_collection, get_cleaned_collection
+from llm_runner import get_llm_runner, get_extraction_llm
+from llm_cache import parses_as_json
+from parsed_resume import ParsedResume
+from fingerprints import source_fingerprints, output_fingerprints, changed_sections
 
-# MongoDB connection
-MONGO_URI = os.getenv("MONGO_URI")
-client = MongoClient(MONGO_URI)
-db = client["CandidateMatch"]
-resume_collection = db["Resume_parsed"]
-cleaned_collection = db["Cleaned"]
-
-# LangChain model setup
-llm = GoogleGenerativeAI(model=GEMINI_MODEL, google_api_key=GEMINI_API_KEY)
-conversation = ConversationChain(llm=llm, memory=ConversationBufferMemory())
+# Descriptions packed into one batched extraction prompt
+LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", "20"))
 
 # Function to fill missing details using LLM
 async def fill_missing_details(field_name, existing_value, resume_text):
@@ -37,10 +26,8 @@ async def fill_missing_details(field_name, existing_value, resume_text):
     Resume:
     {resume_text}
     """
-    loop = asyncio.get_event_loop()
-
     try:
-        response = await loop.run_in_executor(None, conversation.run, prompt)
+        response = await get_llm_runner().run(prompt, get_extraction_llm().run)
         if response:
             response = response.strip()
             if response.lower().startswith("none"):
@@ -53,13 +40,9 @@ async def fill_missing_details(field_name, existing_value, resume_text):
     
 async def clean_education_history(education_details, resume_text, conversation):
     cleaned_education = []
-    data = resume_collection.find_one()
-    if not data:
-        print("No resume found.")
-        return []
 
-    # Convert parsed JSON to a readable string
-    resume_text = json.dumps(json.loads(data.get("resumeParseData", "{}")), indent=2)
+    # Readable (indented) JSON, built once per parsed resume
+    resume_text = ParsedResume.of(resume_text).pretty_text
     
     # Initial population from existing education details
     existing_education = {}
@@ -105,7 +88,7 @@ async def clean_education_history(education_details, resume_text, conversation):
     """
 
     try:
-        response = conversation.run(prompt)
+        response = await get_llm_runner().run(prompt, partial(conversation.run, accept=parses_as_json))
         response = response.strip("`")
         response = re.sub(r"^```(?:json)?\n|\n```$", "", response.strip(), flags=re.MULTILINE)
 
@@ -168,15 +151,6 @@ def clean_employment_history(employment_positions):
 async def extract_projects_from_resume_parse(resume_parse_data, conversation, resume_text, dev_project_details):
     projects = []
 
-    # Fetch data from database safely
-    try:
-        data = resume_collection.find_one() or {}
-        dev_project_details = data.get("devProjectDetails", [])
-        resume_parse_data = data.get("resumeParseData", {})
-    except Exception as e:
-        print(f"Error fetching data from database: {e}")
-        dev_project_details = []
-
     # 1. Prioritize devProjectDetails
     if dev_project_details:
         return [
@@ -190,22 +164,15 @@ async def extract_projects_from_resume_parse(resume_parse_data, conversation, re
         ]
 
     # 2. Extract projects from parsed resume data
-    parsed_data = {}
-    if isinstance(resume_parse_data, str):
-        try:
-            parsed_data = json.loads(resume_parse_data)
-        except json.JSONDecodeError:
-            print("Error decoding resumeParseData for project extraction.")
-    elif isinstance(resume_parse_data, dict):
-        parsed_data = resume_parse_data
-
-    if parsed_data:
-        parsed_projects = parsed_data.get("Projects", [])
+    parsed_resume = ParsedResume.of(resume_parse_data)
+
+    if parsed_resume.data:
+        parsed_projects = parsed_resume.projects
         if parsed_projects:
             return await process_projects(parsed_projects, conversation)
 
         # 3. If no projects, check EmploymentHistory
-        employment_history = parsed_data.get("EmploymentHistory", {}).get("Positions", [])
+        employment_history = parsed_resume.positions
         employment_projects = await extract_projects_from_employment(conversation, employment_history)
         projects.extend(employment_projects)
     
@@ -218,10 +185,6 @@ async def extract_projects_from_resume_parse(resume_parse_data, conversation, re
 async def process_projects(parsed_projects, conversation):
     projects = []
     for project in parsed_projects:
-        description = project.get("description", "")
-        tools_used = project.get("tools_used/skill_used", [])
-        soft_skills = project.get("Soft_skills", [])
-        
         project_name = project.get("project_name", "")
         if isinstance(project_name, dict):
             project_name = project_name.get("Normalized", project_name.get("Raw", ""))
@@ -230,33 +193,34 @@ async def process_projects(parsed_projects, conversation):
         if isinstance(project_name, dict):
             project_name = project_name.get("Normalized", "")
 
-        # Use LLM if details are missing
-        if not tools_used or not soft_skills:
-            extracted_data = await run_llm_extraction(conversation, description)
-            tools_used = extracted_data.get("tools_used/skill_used", tools_used)
-            soft_skills = extracted_data.get("Soft_skills", soft_skills)
-
         projects.append({
             "project_name": project_name,
-            "tools_used/skill_used": tools_used,
-            "Soft_skills": soft_skills,
-            "description": description
+            "tools_used/skill_used": project.get("tools_used/skill_used", []),
+            "Soft_skills": project.get("Soft_skills", []),
+            "description": project.get("description", "")
         })
+
+    # Use LLM if details are missing, for all such projects in one batched prompt
+    missing = [p for p in projects if not p["tools_used/skill_used"] or not p["Soft_skills"]]
+    extracted = await run_llm_batch_extraction(conversation, [p["description"] for p in missing])
+    for project, extracted_data in zip(missing, extracted):
+        project["tools_used/skill_used"] = extracted_data.get("tools_used/skill_used", project["tools_used/skill_used"])
+        project["Soft_skills"] = extracted_data.get("Soft_skills", project["Soft_skills"])
     return projects
 
 async def extract_projects_from_employment(conversation, employment_history):
+    jobs = [job for job in employment_history if job.get("Description", "")]
+
+    # All positions are extracted with one batched prompt
+    extracted = await run_llm_batch_extraction(conversation, [job.get("Description", "") for job in jobs])
     projects = []
-    for job in employment_history:
-        job_title = job.get("JobTitle", "")
-        description = job.get("Description", "")
-        if description:
-            extracted_data = await run_llm_extraction(conversation, description)
-            projects.append({
-                "project_name": job_title,
-                "tools_used/skill_used": extracted_data.get("tools_used/skill_used", []),
-                "Soft_skills": extracted_data.get("Soft_skills", []),
-                "description": description
-            })
+    for job, extracted_data in zip(jobs, extracted):
+        projects.append({
+            "project_name": job.get("JobTitle", ""),
+            "tools_used/skill_used": extracted_data.get("tools_used/skill_used", []),
+            "Soft_skills": extracted_data.get("Soft_skills", []),
+            "description": job.get("Description", "")
+        })
     return projects
 
 async def extract_projects_from_resume_text(conversation, resume_text):
@@ -299,11 +263,62 @@ async def run_llm_extraction(conversation, description):
       "Soft_skills": ["Skill1", "Skill2"]
     }}
     """
-    return await run_llm_json_extraction(conversation, prompt)
+    extracted_data = await run_llm_json_extraction(conversation, prompt)
+    # Failed extractions come back as []; callers expect a dict
+    return extracted_data if isinstance(extracted_data, dict) else {}
 
-async def run_llm_json_extraction(conversation, prompt):
+def build_batch_extraction_prompt(items):
+    return f"""
+    Extract the following details from EACH description below:
+    - List of tools/technologies used
+    - List of soft skills demonstrated
+
+    Descriptions (JSON array of items with "id" and "description"):
+    {json.dumps(items, indent=2)}
+
+    Output a JSON array with exactly one object per description, keeping its "id":
+    [
+      {{"id": 0, "tools_used/skill_used": ["Technology1", "Technology2"], "Soft_skills": ["Skill1", "Skill2"]}}
+    ]
+    """
+
+async def run_llm_batch_extraction(conversation, descriptions, batch_size=LLM_BATCH_SIZE, retries=1):
+    """
+    Same output as run_llm_extraction for each description, with one LLM call
+    per batch_size descriptions instead of one per description.
+
+    Items are tagged with ids; items missing or malformed in the response are
+    retried (only those) up to `retries` times and end up as {} like a failed
+    single-item extraction. Retries skip the response cache, since a retried
+    batch can be the exact prompt whose answer was unusable.
+    """
+    results = {}
+    pending = list(range(len(descriptions)))
+    for attempt in range(retries + 1):
+        if not pending:
+            break
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        responses = await asyncio.gather(*(
+            run_llm_json_extraction(conversation, build_batch_extraction_prompt(
+                [{"id": item_id, "description": descriptions[item_id]} for item_id in batch]
+            ), bypass=attempt > 0)
+            for batch in batches
+        ))
+        for batch, response in zip(batches, responses):
+            for item in response if isinstance(response, list) else []:
+                item_id = item.get("id") if isinstance(item, dict) else None
+                if isinstance(item_id, str) and item_id.isdigit():
+                    item_id = int(item_id)
+                if item_id in batch and item_id not in results:
+                    results[item_id] = {key: value for key, value in item.items() if key != "id"}
+        pending = [item_id for item_id in pending if item_id not in results]
+    return [results.get(item_id, {}) for item_id in range(len(descriptions))]
+
+async def run_llm_json_extraction(conversation, prompt, bypass=False):
     try:
-        response = conversation.run(prompt).strip()
+        # Only replies that parse are cached; bypass skips the cache altogether
+        llm_call = partial(conversation.run, bypass=bypass, accept=parses_as_json)
+        response = (await get_llm_runner().run(prompt, llm_call)).strip()
         response = re.sub(r"^```(?:json)?\n|\n```$", "", response, flags=re.MULTILINE)
         extracted_data = json.loads(response) if response.startswith("{") or response.startswith("[") else []
         return extracted_data
@@ -314,75 +329,82 @@ async def run_llm_json_extraction(conversation, prompt):
     return []
 
 def extract_skills_from_resume_parse(resume_parse_data):
-    skills = set()
-    if isinstance(resume_parse_data, str):
-        try:
-            parsed_data = json.loads(resume_parse_data)
-            skills_data_list = parsed_data.get("SkillsData", [])
-            for skills_data in skills_data_list:
-                taxonomies = skills_data.get("Taxonomies", [])
-                for taxonomy in taxonomies:
-                    sub_taxonomies = taxonomy.get("SubTaxonomies", [])
-                    for sub_taxonomy in sub_taxonomies:
-                        skill_list = sub_taxonomy.get("Skills", [])
-                        for skill_item in skill_list:
-                            skill_name = skill_item.get("Name")
-                            if skill_name:
-                                skills.add(skill_name)
-        except json.JSONDecodeError as e:
-            print(f"Error decoding resumeParseData for skill extraction: {e}")
-    return sorted(list(skills))
-
-async def process_single_resume():
-    data = resume_collection.find_one()
+    return ParsedResume.of(resume_parse_data).skills
+
+async def _reuse(value):
+    return value
+
+async def process_single_resume(data=None, previous=None):
+    """
+    Clean one resume document.
+
+    With `previous` (the earlier cleaned output of the same document, as
+    stored with its "fingerprints"), sections whose inputs have not changed
+    are copied instead of re-running their LLM prompts, and an unchanged
+    document returns `previous` itself.
+    """
+    # Stateless: every prompt is sent on its own, without earlier resumes' history
+    conversation = get_extraction_llm()
+    # Without a document, clean the first resume in the collection
+    if data is None:
+        data = get_resume_collection().find_one()
     if not data:
         print("No resume found.")
         return
-    resume_text = data.get("resumeParseData", "")
-    resume_parse_data = json.loads(resume_text) if isinstance(resume_text, str) else {}
-    contact_info = resume_parse_data.get("ContactInformation", {})
+    # Decoded once; every step below reads memoized views of the same object
+    resume = ParsedResume(data.get("resumeParseData", ""))
+    contact_info = resume.contact_info
+    fingerprints = source_fingerprints(data, resume)
+    unchanged = set()
+    if previous:
+        unchanged = set(fingerprints) - changed_sections(previous.get("fingerprints"), fingerprints)
+        if "document" in unchanged:
+            return previous
 
     full_name = data.get("fName", "").strip() + " " + data.get("lName", "").strip() if data.get("fName") or data.get("lName") else contact_info.get("FullName", {}).get("Raw", "")
     email = data.get("email", "") or contact_info.get("EmailAddresses", [None])[0]
     phone_number = data.get("number", "") or contact_info.get("Telephones", [{}])[0].get("Raw", "")
     job_title = data.get("devDesg", "")
-    city = data.get("devCity", "") or contact_info.get("Location", {}).get("Municipality", "")
-    state = data.get("devState", "") or contact_info.get("Location", {}).get("Region", "")
-    country_code = data.get("devCountryCode", "") or contact_info.get("Location", {}).get("CountryCode", "")
+    city = data.get("devCity", "") or resume.location.get("Municipality", "")
+    state = data.get("devState", "") or resume.location.get("Region", "")
+    country_code = data.get("devCountryCode", "") or resume.location.get("CountryCode", "")
     linkedin = data.get("devSocialProfile", {}).get("linkedin", "")
     github = data.get("devSocialProfile", {}).get("gitHub", "")
     portfolio = data.get("devSocialProfile", {}).get("portfolio", "")
 
     # Skills: Combine and prioritize data.get("devSkills")
     candidate_skills = [skill.strip() for skill in data.get("devSkills", []) if skill.strip()]
-    parsed_skills = extract_skills_from_resume_parse(resume_text)
+    parsed_skills = resume.skills
     all_skills = sorted(list(set(candidate_skills + parsed_skills)))
 
     # Languages: Prioritize data.get("languages")
     candidate_languages = [lang.strip() for lang in data.get("languages", "").split(",") if lang.strip()]
-    parsed_languages = [lang.get("Language", "").strip() for lang in resume_parse_data.get("LanguageCompetencies", []) if lang.get("Language")]
+    parsed_languages = resume.languages
     all_languages = sorted(list(set(candidate_languages + parsed_languages)))
 
-    employment_history = clean_employment_history(resume_parse_data.get("EmploymentHistory", {}).get("Positions", []))
-    education = await clean_education_history(
-        data.get("devAcademic", []), 
-        resume_text, 
-        conversation
-    )
+    employment_history = clean_employment_history(resume.positions)
     #work preference
     work_preference=data.get("jobPreference","")
     work_experience = data.get("devTotalExperience", "")
-    # Use the updated project extraction with conversation
-    projects = await extract_projects_from_resume_parse(
-        resume_text, 
-        conversation, 
-        resume_text, 
-        data.get("devProjects", [])
-    )
 
-    # Try to get current job title from resume if not provided
-    if not job_title:
-        job_title = await fill_missing_details("current job title", "", resume_text)
+    # Education, projects and the missing job title are extracted concurrently
+    # (sections unchanged since the previous run are reused as is)
+    education, projects, job_title = await asyncio.gather(
+        _reuse(previous.get("Education")) if "education" in unchanged else clean_education_history(
+            data.get("devAcademic", []), 
+            resume, 
+            conversation
+        ),
+        # Use the updated project extraction with conversation
+        _reuse(previous.get("Projects")) if "projects" in unchanged else extract_projects_from_resume_parse(
+            resume, 
+            conversation, 
+            resume, 
+            data.get("devProjectDetails", [])
+        ),
+        # Try to get current job title from resume if not provided
+        _reuse(previous.get("Current Job Title")) if "job_title" in unchanged else fill_missing_details("current job title", job_title, resume)
+    )
 
     cleaned_data = {
         "Full Name": full_name,
@@ -403,12 +425,100 @@ async def process_single_resume():
         "Languages Known": all_languages,
         "Projects": projects
     }
+    # Stored with the cleaned output so the next run can tell what changed
+    cleaned_data["fingerprints"] = {**fingerprints, **output_fingerprints(cleaned_data)}
     return cleaned_data
 
 
+def _next_batch(cursor, batch_size):
+    """Blocking read of up to batch_size documents from a cursor"""
+    batch = []
+    for data in cursor:
+        batch.append(data)
+        if len(batch) >= batch_size:
+            break
+    return batch
+
+def _find_previous(output_collection, resume_ids):
+    """Blocking read of the stored cleaned documents for a batch, keyed on resume_id"""
+    return {doc["resume_id"]: doc for doc in output_collection.find({"resume_id": {"$in": resume_ids}})}
+
+def _write_cleaned(output_collection, documents, upsert):
+    """Blocking bulk write of cleaned resumes"""
+    if upsert:
+        from pymongo import ReplaceOne
+        operations = [ReplaceOne({"resume_id": doc["resume_id"]}, doc, upsert=True) for doc in documents]
+        output_collection.bulk_write(operations, ordered=False)
+    else:
+        output_collection.insert_many(documents, ordered=False)
+
+async def process_resumes(collection=None, output_collection=None, query=None, batch_size=100, concurrency=8, upsert=True,
+                          incremental=False):
+    """
+    Clean every resume matching query, streaming from a cursor.
+
+    Documents are read batch_size at a time, each document is passed through
+    process_single_resume once, at most `concurrency` resumes are in flight,
+    and every batch is written to output_collection with one bulk upsert
+    (or insert_many when upsert is False) keyed on the source resume _id.
+    Collections default to Resume_parsed / Cleaned but any pymongo-compatible
+    collection (e.g. mongomock) can be passed in.
+
+    With incremental=True the stored cleaned documents of each batch are
+    loaded first: unchanged documents are skipped (not even rewritten) and
+    changed ones only recompute the sections whose fingerprints differ.
+    """
+    collection = collection if collection is not None else get_resume_collection()
+    output_collection = output_collection if output_collection is not None else get_cleaned_collection()
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = {"processed": 0, "failed": 0, "written": 0, "unchanged": 0}
+
+    async def clean(data, previous=None):
+        async with semaphore:
+            try:
+                cleaned_data = await process_single_resume(data, previous)
+            except Exception as e:
+                print(f"Error processing resume {data.get('_id')}: {e}")
+                stats["failed"] += 1
+                return None
+        if previous is not None and cleaned_data is previous:
+            stats["unchanged"] += 1
+            return None
+        stats["processed"] += 1
+        return {**cleaned_data, "resume_id": data.get("_id")} if cleaned_data else None
+
+    cursor = iter(collection.find(query or {}).batch_size(batch_size))
+    while True:
+        batch = await loop.run_in_executor(None, _next_batch, cursor, batch_size)
+        if not batch:
+            break
+        previous = {}
+        if incremental:
+            previous = await loop.run_in_executor(
+                None, _find_previous, output_collection, [data.get("_id") for data in batch]
+            )
+        cleaned_batch = [
+            doc for doc in await asyncio.gather(*(clean(data, previous.get(data.get("_id"))) for data in batch)) if doc
+        ]
+        if cleaned_batch:
+            await loop.run_in_executor(None, _write_cleaned, output_collection, cleaned_batch, upsert)
+            stats["written"] += len(cleaned_batch)
+    return stats
+
+
 async def main():
     print("Processing resumes...")
     start_time = time.time()
+
+    # Clean the whole collection into the Cleaned collection
+    if "--all" in sys.argv:
+        # --incremental: only re-clean documents (and sections) that changed since the last run
+        stats = await process_resumes(incremental="--incremental" in sys.argv)
+        print(f"Processed {stats['processed']} resumes ({stats['failed']} failed, {stats['written']} written, "
+              f"{stats['unchanged']} unchanged) in {time.time() - start_time} seconds.")
+        return
+
     cleaned_data = await process_single_resume()
 
 
@@ -419,7 +529,7 @@ async def main():
 
 
         # Optional: Save to MongoDB
-        # cleaned_collection.insert_one(cleaned_data)
+        # get_cleaned_collection().insert_one(cleaned_data)
 
     print(f"Processing completed in {time.time() - start_time} seconds.")
 
@@ -0,0 +1,96 @@
+from dotenv import load_dotenv
+import os
+import threading
+load_dotenv()
+
+# Set up Gemini API key and model
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+GEMINI_MODEL = os.getenv("GEMINI_MODEL")
+GENAI_MODEL = os.getenv("GEMINI_MODEL", "gemini-pro")
+
+# MongoDB connection
+MONGO_URI = os.getenv("MONGO_URI")
+
+# Local SQLite caches (LLM responses, company profiles, geocodes) live here
+# instead of the current working directory; the directory is git-ignored
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "cache"))
+
+# Lazily created, process-wide handles. Nothing here connects or imports the
+# heavy client libraries until the first call, and every caller (threads,
+# asyncio tasks, executor workers) shares the same instance afterwards.
+# Forked worker processes create their own on first use, which is what
+# MongoClient requires anyway.
+_handles = {}
+# Reentrant: a factory may create the handles it depends on (extraction LLM -> LLM cache)
+_lock = threading.RLock()
+
+
+def _shared(name, factory):
+    handle = _handles.get(name)
+    if handle is None:
+        with _lock:
+            handle = _handles.get(name)
+            if handle is None:
+                handle = _handles[name] = factory()
+    return handle
+
+
+def cache_file(filename):
+    """Default path of a local cache file under CACHE_DIR"""
+    return os.path.join(CACHE_DIR, filename)
+
+
+def connect_sqlite(path):
+    """Open a SQLite cache shared across threads, creating its directory if needed"""
+    import sqlite3
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return sqlite3.connect(path, check_same_thread=False)
+
+
+def get_mongo_client():
+    def create():
+        from pymongo import MongoClient
+        return MongoClient(MONGO_URI)
+    return _shared("mongo_client", create)
+
+
+def get_db():
+    return get_mongo_client()["CandidateMatch"]
+
+
+def get_resume_collection():
+    return get_db()["Resume_parsed"]
+
+
+def get_cleaned_collection():
+    return get_db()["Cleaned"]
+
+
+def get_llm():
+    def create():
+        from langchain_google_genai import GoogleGenerativeAI
+        return GoogleGenerativeAI(model=GEMINI_MODEL, google_api_key=GEMINI_API_KEY)
+    return _shared("llm", create)
+
+
+def get_genai_model():
+    def create():
+        import google.generativeai as genai
+        genai.configure(api_key=GEMINI_API_KEY)
+        return genai.GenerativeModel(model_name=GENAI_MODEL)
+    return _shared("genai_model", create)
+
+
+def get_geolocator():
+    def create():
+        from geopy.geocoders import Nominatim
+        return Nominatim(user_agent="resume_location_finder")
+    return _shared("geolocator", create)
+
+
+def reset_handles():
+    """Drop all cached handles (e.g. in a child process after fork)"""
+    with _lock:
+        _handles.clear()
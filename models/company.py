@@ -1,20 +1,13 @@
-import google.generativeai as genai
-from dotenv import load_dotenv
-import os
 import json
 import asyncio
 import re
 from typing import List, Dict, Any
 from cleaned import process_single_resume
-
-load_dotenv()
-
-# Set up Gemini API key
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-pro")
-
-# Initialize Gemini model
-model = genai.GenerativeModel(model_name=GEMINI_MODEL)
+# Gemini model is configured and created on first use
+from clients import GENAI_MODEL, _shared
+from gemini_client import get_gemini_client
+from company_store import CompanyProfileStore
+from llm_cache import get_llm_cache
 
 def clean_json_response(response_text: str) -> Dict[str, Any]:
     """
@@ -76,11 +69,15 @@ async def extract_company_details(company_name: str) -> Dict[str, Any]:
     """
     
     try:
-        # Use generate_content with error handling
-        response = model.generate_content(prompt)
+        # Non-blocking, rate-limited and retried generate_content (answered from the shared cache when possible)
+        # Unparseable answers are not cached, so the store's later retry gets a fresh one
+        response_text = await get_llm_cache().cached_call_async(
+            GENAI_MODEL, prompt, lambda: get_gemini_client().generate(prompt),
+            accept=lambda text: "error" not in clean_json_response(text)
+        )
         
         # Clean and parse the response
-        company_details = clean_json_response(response.text)
+        company_details = clean_json_response(response_text)
         
         # Ensure company name is included
         company_details['company_name'] = company_name
@@ -94,15 +91,25 @@ async def extract_company_details(company_name: str) -> Dict[str, Any]:
             "error": str(e)
         }
 
+def get_company_store() -> CompanyProfileStore:
+    """
+    Process-wide company profile store backed by extract_company_details
+    """
+    return _shared("company_store", lambda: CompanyProfileStore(extract_company_details))
+
 async def process_companies(employment_history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Process all companies in the employment history
+
+    Each distinct (normalized) employer is looked up once; repeated or
+    near-duplicate names share the stored profile.
     """
+    store = get_company_store()
     tasks = []
     for job in employment_history:
         company_name = job.get("company", "")
         if company_name:
-            task = extract_company_details(company_name)
+            task = store.get_profile(company_name)
             tasks.append(task)
     
     company_details = await asyncio.gather(*tasks)
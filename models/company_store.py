@@ -0,0 +1,157 @@
+import asyncio
+import difflib
+import json
+import os
+import re
+import time
+from clients import cache_file, connect_sqlite
+
+# Store location and refresh policy (override through the environment)
+COMPANY_STORE_PATH = os.getenv("COMPANY_STORE_PATH", cache_file("company_profiles.sqlite3"))
+COMPANY_PROFILE_MAX_AGE = float(os.getenv("COMPANY_PROFILE_MAX_AGE_DAYS", "180")) * 24 * 3600
+
+# Legal-form suffixes that do not identify a company
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "ltd", "limited", "llc", "llp", "plc", "pvt", "private",
+    "corp", "corporation", "co", "company", "gmbh", "ag", "sa", "pte", "pty",
+}
+
+# Common abbreviations / plural forms mapped to one spelling
+TOKEN_ALIASES = {
+    "tech": "technology", "technologies": "technology", "techs": "technology",
+    "solution": "solutions", "sol": "solutions", "sols": "solutions",
+    "svc": "services", "svcs": "services", "service": "services",
+    "sys": "systems", "system": "systems",
+    "intl": "international", "int'l": "international",
+    "mgmt": "management", "grp": "group", "&": "and",
+}
+
+
+def normalize_company_name(name):
+    """Lowercase, drop punctuation and legal suffixes, unify abbreviations"""
+    tokens = re.findall(r"[a-z0-9&']+", (name or "").lower())
+    tokens = [TOKEN_ALIASES.get(token, token) for token in tokens]
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+class CompanyProfileStore:
+    """
+    Shared knowledge base of company profiles.
+
+    Employer names are normalized and fuzzy-matched to a canonical key, so
+    "Archs Solutions Technology" and "Archs Solutions Tech." resolve to the
+    same profile. Profiles are fetched with `fetch` (extract_company_details)
+    at most once per canonical company: concurrent requests for the same
+    company await the same in-flight call, and results are persisted in
+    SQLite and only refreshed after `max_age` seconds.
+    """
+
+    def __init__(self, fetch, path=COMPANY_STORE_PATH, max_age=COMPANY_PROFILE_MAX_AGE, similarity=0.9):
+        self.fetch = fetch
+        self.max_age = max_age
+        self.similarity = similarity
+        self.stats = {"hits": 0, "fetches": 0, "deduplicated": 0}
+        self._in_flight = {}
+        self._db = connect_sqlite(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS companies (key TEXT PRIMARY KEY, name TEXT, profile TEXT, fetched_at REAL)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS aliases (alias TEXT PRIMARY KEY, key TEXT)")
+        self._db.commit()
+
+        # Canonical keys blocked by first token, and alias -> canonical key
+        self._aliases = dict(self._db.execute("SELECT alias, key FROM aliases"))
+        self._blocks = {}
+        for (key,) in self._db.execute("SELECT key FROM companies"):
+            self._add_key(key)
+
+    def _add_key(self, key):
+        block = self._blocks.setdefault(key.split(" ", 1)[0], [])
+        if key not in block:
+            block.append(key)
+
+    @staticmethod
+    def _is_truncation(a, b):
+        """Same name with the final word cut short, e.g. "archs solutions techn" vs "archs solutions technology"
+
+        Abbreviations elsewhere are unified by TOKEN_ALIASES; a shortened word
+        in the middle of a name is too weak a signal to merge companies.
+        """
+        a_tokens, b_tokens = a.split(), b.split()
+        if len(a_tokens) != len(b_tokens) or a_tokens[:-1] != b_tokens[:-1]:
+            return False
+        x, y = a_tokens[-1], b_tokens[-1]
+        return x == y or (min(len(x), len(y)) >= 3 and (x.startswith(y) or y.startswith(x)))
+
+    def _is_same(self, a, b):
+        return self._is_truncation(a, b) or difflib.SequenceMatcher(None, a, b).ratio() >= self.similarity
+
+    def canonical_key(self, company_name):
+        """Resolve a raw employer name to its canonical company key"""
+        normalized = normalize_company_name(company_name)
+        if not normalized:
+            return ""
+        key = self._aliases.get(normalized)
+        if key:
+            return key
+
+        key = normalized
+        block = self._blocks.get(normalized.split(" ", 1)[0], [])
+        # A truncated name that fits several companies ("tata con": consultancy or consumer) stays its own key
+        truncations = [candidate for candidate in block if self._is_truncation(normalized, candidate)]
+        if len(truncations) == 1:
+            key = truncations[0]
+        elif not truncations:
+            for candidate in block:
+                if self._is_same(normalized, candidate):
+                    key = candidate
+                    break
+        self._aliases[normalized] = key
+        self._add_key(key)
+        self._db.execute("INSERT OR REPLACE INTO aliases VALUES (?, ?)", (normalized, key))
+        self._db.commit()
+        return key
+
+    def _load(self, key):
+        row = self._db.execute("SELECT profile, fetched_at FROM companies WHERE key = ?", (key,)).fetchone()
+        if row is None or (self.max_age and time.time() - row[1] > self.max_age):
+            return None
+        return json.loads(row[0])
+
+    def _save(self, key, company_name, profile):
+        self._db.execute(
+            "INSERT OR REPLACE INTO companies VALUES (?, ?, ?, ?)",
+            (key, company_name, json.dumps(profile), time.time())
+        )
+        self._db.commit()
+
+    async def get_profile(self, company_name):
+        """Profile for company_name, fetching it only if no fresh copy exists"""
+        key = self.canonical_key(company_name)
+        if not key:
+            return await self.fetch(company_name)
+
+        profile = self._load(key)
+        if profile is not None:
+            self.stats["hits"] += 1
+        else:
+            task = self._in_flight.get(key)
+            if task is None:
+                task = self._in_flight[key] = asyncio.ensure_future(self._fetch(key, company_name))
+                task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            else:
+                self.stats["deduplicated"] += 1
+            profile = await asyncio.shield(task)
+
+        # Same profile, reported under the name the caller used
+        return {**profile, "company_name": company_name, "canonical_name": key}
+
+    async def _fetch(self, key, company_name):
+        self.stats["fetches"] += 1
+        profile = await self.fetch(company_name)
+        # Failed lookups are not persisted so they are retried next time
+        if "error" not in profile:
+            self._save(key, company_name, profile)
+        return profile
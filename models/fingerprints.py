@@ -0,0 +1,52 @@
+import hashlib
+import json
+
+# Bump when cleaning logic or prompts change so every stored section is recomputed
+FINGERPRINT_VERSION = "1"
+
+
+def fingerprint(value):
+    """Stable content hash of any JSON-like value (ObjectIds/dates via str)"""
+    payload = json.dumps([FINGERPRINT_VERSION, value], sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def source_fingerprints(data, resume):
+    """
+    Fingerprints of the inputs of each cleaning section.
+
+    `document` covers the whole source document; the other entries cover
+    only what that section reads, so an edit to e.g. devAcademic re-runs the
+    education prompt but not the project extraction. Sections whose prompts
+    include the full resume text depend on it as well.
+    """
+    job_title = data.get("devDesg", "")
+    return {
+        "document": fingerprint(data),
+        "contact": fingerprint([
+            data.get(key) for key in ("fName", "lName", "email", "number", "devCity", "devState",
+                                      "devCountryCode", "devSocialProfile")
+        ] + [resume.contact_info]),
+        "skills": fingerprint([data.get("devSkills", []), resume.skills]),
+        "languages": fingerprint([data.get("languages", ""), resume.languages]),
+        "employment": fingerprint(resume.positions),
+        "education": fingerprint([data.get("devAcademic", []), resume.text]),
+        "projects": fingerprint([data.get("devProjectDetails", []), resume.text]),
+        "job_title": fingerprint([job_title, None if job_title and job_title.strip() else resume.text]),
+    }
+
+
+def output_fingerprints(cleaned_data):
+    """Fingerprints of the cleaned fields the downstream stages read"""
+    employment = cleaned_data.get("Employment History", [])
+    return {
+        "location": fingerprint([cleaned_data.get(key, "") for key in ("City", "State", "Country Code")]),
+        "companies": fingerprint(sorted({job.get("company", "") for job in employment if job.get("company")})),
+        "stability": fingerprint([[job.get("company"), job.get("from"), job.get("to")] for job in employment]),
+    }
+
+
+def changed_sections(previous, current):
+    """Sections whose fingerprint differs from (or is missing in) previous"""
+    previous = previous or {}
+    return {section for section, value in current.items() if previous.get(section) != value}
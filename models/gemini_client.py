@@ -0,0 +1,108 @@
+import asyncio
+import os
+import random
+import time
+import weakref
+from collections import deque
+from clients import _shared, get_genai_model
+from rate_limit import TokenBucket
+
+# Provider quota and retry policy (override through the environment)
+GEMINI_REQUESTS_PER_MINUTE = float(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "60"))
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "5"))
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "60"))
+
+# HTTP statuses / exception names worth retrying (quota and transient errors)
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = {
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+    "DeadlineExceeded", "GatewayTimeout", "BadGateway", "TimeoutError", "ConnectionError",
+}
+
+
+def is_retryable(error):
+    """True for quota (429) and transient server/network errors"""
+    code = getattr(error, "code", None)
+    code = code() if callable(code) else code
+    if isinstance(code, int) and code in RETRYABLE_STATUS:
+        return True
+    return any(cls.__name__ in RETRYABLE_ERRORS for cls in type(error).__mro__)
+
+
+async def _gemini_generate(prompt):
+    response = await get_genai_model().generate_content_async(prompt)
+    return response.text
+
+
+class AsyncGeminiClient:
+    """
+    Rate-limited, retrying async wrapper around Gemini generate_content.
+
+    Requests pass a token bucket (requests_per_minute), a concurrency cap and
+    a per-attempt timeout. Quota and transient errors are retried with
+    exponential backoff plus full jitter. `generate` can be any async
+    prompt -> text callable (e.g. a client for a local fake server).
+    """
+
+    def __init__(self, generate=_gemini_generate, requests_per_minute=GEMINI_REQUESTS_PER_MINUTE,
+                 max_concurrency=GEMINI_MAX_CONCURRENCY, max_retries=GEMINI_MAX_RETRIES,
+                 base_delay=1.0, max_delay=30.0, timeout=GEMINI_TIMEOUT):
+        self._generate = generate
+        self.bucket = TokenBucket(requests_per_minute / 60.0)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.metrics = {"requests": 0, "succeeded": 0, "failed": 0, "retries": 0, "throttled": 0}
+        self.latencies = deque(maxlen=10000)
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def _semaphore(self):
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    def backoff(self, attempt):
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    async def generate(self, prompt):
+        """Generate text for prompt; raises the last error once retries run out"""
+        self.metrics["requests"] += 1
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore():
+                    await self.bucket.acquire()
+                    text = await asyncio.wait_for(self._generate(prompt), timeout=self.timeout)
+                self.metrics["succeeded"] += 1
+                self.latencies.append(time.perf_counter() - start)
+                return text
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    self.metrics["failed"] += 1
+                    self.latencies.append(time.perf_counter() - start)
+                    raise
+                if getattr(e, "code", None) == 429 or type(e).__name__ in ("ResourceExhausted", "TooManyRequests"):
+                    self.metrics["throttled"] += 1
+                self.metrics["retries"] += 1
+                await asyncio.sleep(self.backoff(attempt))
+                attempt += 1
+
+    def latency_summary(self):
+        """p50 / p95 / max request latency in seconds (including retries)"""
+        if not self.latencies:
+            return {}
+        ordered = sorted(self.latencies)
+        pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+        return {"count": len(ordered), "p50": pick(0.5), "p95": pick(0.95), "max": ordered[-1]}
+
+
+def get_gemini_client():
+    """Process-wide Gemini client shared by every company lookup"""
+    return _shared("gemini_client", AsyncGeminiClient)
@@ -0,0 +1,204 @@
+import asyncio
+import csv
+import os
+import re
+import time
+import pycountry
+from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+from clients import _shared, get_geolocator, cache_file, connect_sqlite
+from rate_limit import TokenBucket
+
+# Offline gazetteer, persistent cache and Nominatim policy (override through the environment)
+GAZETTEER_PATH = os.getenv("GAZETTEER_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "gazetteer.csv"))
+GEOCODE_CACHE_PATH = os.getenv("GEOCODE_CACHE_PATH", cache_file("geocode_cache.sqlite3"))
+GEOCODE_NEGATIVE_TTL = float(os.getenv("GEOCODE_NEGATIVE_TTL_DAYS", "7")) * 24 * 3600
+NOMINATIM_REQUESTS_PER_SECOND = float(os.getenv("NOMINATIM_REQUESTS_PER_SECOND", "1"))
+
+
+def normalize_place(value):
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", (value or "").lower())).strip()
+
+
+def country_code(country):
+    """ISO alpha-2 code for a country name or code ('India', 'IN', 'IND')"""
+    if not country:
+        return ""
+    try:
+        return pycountry.countries.lookup(country.strip()).alpha_2
+    except LookupError:
+        return normalize_place(country)
+
+
+def _initials(name):
+    words = name.split()
+    return "".join(word[0] for word in words) if len(words) > 1 else ""
+
+
+class Gazetteer:
+    """
+    Offline city index loaded from a local file.
+
+    Accepts either a CSV with a header (city, state, state_code, country_code,
+    latitude, longitude[, population]) or a GeoNames citiesNNNN.txt dump
+    (tab separated; state names are read from admin1CodesASCII.txt next to it
+    when present). States match by name, code or initials ("UP" ->
+    "Uttar Pradesh"); the most populous matching city wins.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._cities = {}
+        if path and os.path.exists(path):
+            if path.endswith(".csv"):
+                self._load_csv(path)
+            else:
+                self._load_geonames(path)
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._cities.values())
+
+    def add(self, city, state, state_code, country, latitude, longitude, population=0):
+        state = normalize_place(state)
+        self._cities.setdefault((normalize_place(city), country_code(country)), []).append({
+            "states": {s for s in (state, normalize_place(state_code), _initials(state)) if s},
+            "latitude": float(latitude),
+            "longitude": float(longitude),
+            "population": int(population or 0),
+        })
+
+    def _load_csv(self, path):
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                self.add(row["city"], row.get("state", ""), row.get("state_code", ""), row["country_code"],
+                         row["latitude"], row["longitude"], row.get("population") or 0)
+
+    def _load_geonames(self, path):
+        admin1 = {}
+        admin1_path = os.path.join(os.path.dirname(path), "admin1CodesASCII.txt")
+        if os.path.exists(admin1_path):
+            with open(admin1_path, encoding="utf-8") as f:
+                for line in f:
+                    parts = line.rstrip("\n").split("\t")
+                    if len(parts) >= 2:
+                        admin1[parts[0]] = parts[1]
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) < 15:
+                    continue
+                code = parts[8]
+                state = admin1.get(f"{code}.{parts[10]}", "")
+                names = {parts[1], parts[2]}
+                for name in names:
+                    # GeoNames country codes are already alpha-2
+                    self._cities.setdefault((normalize_place(name), code), []).append({
+                        "states": {s for s in (normalize_place(state), normalize_place(parts[10]), _initials(normalize_place(state))) if s},
+                        "latitude": float(parts[4]),
+                        "longitude": float(parts[5]),
+                        "population": int(parts[14] or 0),
+                    })
+
+    def lookup(self, city, state, country):
+        """Coordinates of city (in state, country) or None"""
+        entries = self._cities.get((normalize_place(city), country_code(country)))
+        if not entries:
+            return None
+        state = normalize_place(state)
+        if state:
+            entries = [entry for entry in entries if state in entry["states"]]
+            if not entries:
+                return None
+        best = max(entries, key=lambda entry: entry["population"])
+        return {"latitude": best["latitude"], "longitude": best["longitude"]}
+
+
+class Geocoder:
+    """
+    Coordinates for (city, state, country) without blocking the event loop.
+
+    Lookup order: offline gazetteer, then the persistent query cache, then
+    Nominatim as a rate-limited fallback run in a worker thread. Every
+    Nominatim answer is cached, including "not found" (which expires after
+    `negative_ttl` so it is retried eventually).
+    """
+
+    def __init__(self, gazetteer=None, cache_path=GEOCODE_CACHE_PATH, negative_ttl=GEOCODE_NEGATIVE_TTL,
+                 requests_per_second=NOMINATIM_REQUESTS_PER_SECOND, geocode=None):
+        self.gazetteer = gazetteer if gazetteer is not None else Gazetteer(GAZETTEER_PATH)
+        self.negative_ttl = negative_ttl
+        self.bucket = TokenBucket(requests_per_second, capacity=1)
+        self._geocode = geocode or (lambda query: get_geolocator().geocode(query, timeout=10))
+        self.stats = {"gazetteer": 0, "cache_hits": 0, "nominatim": 0}
+        self._in_flight = {}
+        self._db = connect_sqlite(cache_path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS geocodes (query TEXT PRIMARY KEY, latitude REAL, longitude REAL, created_at REAL)"
+        )
+        self._db.commit()
+
+    def _cached(self, query):
+        row = self._db.execute("SELECT latitude, longitude, created_at FROM geocodes WHERE query = ?", (query,)).fetchone()
+        if row is None:
+            return False, None
+        if row[0] is None:
+            # Cached "not found"
+            if time.time() - row[2] > self.negative_ttl:
+                return False, None
+            return True, None
+        return True, {"latitude": row[0], "longitude": row[1]}
+
+    async def geocode(self, query):
+        """Coordinates for a free-text query (cache first, then Nominatim)"""
+        key = normalize_place(query)
+        if not key:
+            return None
+        found, coordinates = self._cached(key)
+        if found:
+            self.stats["cache_hits"] += 1
+            return coordinates
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = self._in_flight[key] = asyncio.ensure_future(self._nominatim(key, query))
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _nominatim(self, key, query):
+        await self.bucket.acquire()
+        self.stats["nominatim"] += 1
+        try:
+            location = await asyncio.get_running_loop().run_in_executor(None, self._geocode, query)
+        except (GeocoderTimedOut, GeocoderServiceError) as e:
+            # Errors are not cached, so the query is retried next time
+            print(f"Geocoding error: {e}")
+            return None
+        coordinates = {"latitude": location.latitude, "longitude": location.longitude} if location else None
+        self._db.execute(
+            "INSERT OR REPLACE INTO geocodes VALUES (?, ?, ?, ?)",
+            (key, coordinates and coordinates["latitude"], coordinates and coordinates["longitude"], time.time())
+        )
+        self._db.commit()
+        return coordinates
+
+    async def get_coordinates(self, city, state, country):
+        coordinates = self.gazetteer.lookup(city, state, country) if city else None
+        if coordinates:
+            self.stats["gazetteer"] += 1
+            return coordinates
+
+        # Same fallback order as before: full location, city + country, country
+        queries = [f"{city}, {state}, {country}".strip(', ')]
+        if city and country:
+            queries.append(f"{city}, {country}")
+        if country:
+            queries.append(country)
+        for query in queries:
+            coordinates = await self.geocode(query)
+            if coordinates:
+                return coordinates
+        return None
+
+
+def get_geocoder():
+    """Process-wide geocoder shared by every location lookup"""
+    return _shared("geocoder", Geocoder)
@@ -0,0 +1,238 @@
+import asyncio
+import os
+import signal
+import threading
+import time
+from collections import deque
+from clients import get_resume_collection, get_cleaned_collection
+from pipeline import process_candidate
+
+# Worker settings (override through the environment)
+INGEST_MODE = os.getenv("INGEST_MODE", "auto")  # auto | change_stream | poll
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "100"))
+INGEST_CONCURRENCY = int(os.getenv("INGEST_CONCURRENCY", "4"))
+INGEST_POLL_INTERVAL = float(os.getenv("INGEST_POLL_INTERVAL", "2"))
+INGEST_DRAIN_TIMEOUT = float(os.getenv("INGEST_DRAIN_TIMEOUT", "60"))
+
+CHANGE_OPERATIONS = ["insert", "update", "replace"]
+
+
+class IngestWorker:
+    """
+    Long-running worker that cleans and enriches new or updated resumes.
+
+    A source task watches the resume collection (change stream, or polling
+    an updatedAt watermark when change streams are unavailable, e.g. on a
+    standalone server or an in-memory stand-in) and puts documents on a
+    bounded queue; `concurrency` consumers run them through
+    pipeline.process_candidate and upsert the merged profile keyed on
+    resume_id. A full queue blocks the source (backpressure). Several
+    updates of a document that is still queued or in flight collapse into
+    one run with the newest version.
+
+    stop() (also wired to SIGINT/SIGTERM by main) stops reading, lets the
+    consumers finish what is queued (up to drain_timeout) and returns.
+
+    When polling, `watermark` is the (updatedAt, _id) position up to which
+    every document read has been processed (or has failed), so passing it
+    back as `since` after a restart re-reads whatever was still queued at
+    shutdown: processing is at-least-once. The change stream source does
+    not track a resume position.
+    """
+
+    def __init__(self, collection=None, output_collection=None, process=process_candidate,
+                 mode=INGEST_MODE, queue_size=INGEST_QUEUE_SIZE, concurrency=INGEST_CONCURRENCY,
+                 poll_interval=INGEST_POLL_INTERVAL, drain_timeout=INGEST_DRAIN_TIMEOUT,
+                 batch_size=100, watermark_field="updatedAt", since=None):
+        self.collection = collection if collection is not None else get_resume_collection()
+        self.output_collection = output_collection if output_collection is not None else get_cleaned_collection()
+        self.process = process
+        self.mode = mode
+        self.queue_size = queue_size
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.drain_timeout = drain_timeout
+        self.batch_size = batch_size
+        self.watermark_field = watermark_field
+        # (watermark value, _id) up to which everything read is processed; None backfills
+        # everything first. `since` is a watermark value or a (value, _id) pair.
+        if since is not None and not isinstance(since, tuple):
+            since = (since, None)
+        self.watermark = since
+        # Position of the last document read, ahead of `watermark` by what is queued or running
+        self._read_position = since
+        self._positions = deque()
+        self._positions_by_key = {}
+        self.stats = {"received": 0, "coalesced": 0, "processed": 0, "unchanged": 0, "failed": 0, "written": 0}
+        self.latencies = []
+        self._pending = {}
+        self._in_flight = set()
+        self._stopping = threading.Event()
+        self._stop_event = None
+        self._queue = None
+        self._loop = None
+
+    def stop(self):
+        """Request a graceful shutdown (safe to call from signal handlers and other threads)"""
+        self._stopping.set()
+        if self._loop is not None and self._stop_event is not None:
+            self._loop.call_soon_threadsafe(self._stop_event.set)
+
+    @property
+    def stopping(self):
+        return self._stopping.is_set()
+
+    async def run(self):
+        """Run until stop(); returns the stats"""
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        if self.stopping:
+            self._stop_event.set()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        consumers = [asyncio.ensure_future(self._consume()) for _ in range(self.concurrency)]
+        source = asyncio.ensure_future(self._read_source())
+
+        await self._stop_event.wait()
+        await source
+        try:
+            await asyncio.wait_for(self._queue.join(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            print(f"Ingest worker: {self._queue.qsize()} queued resumes left unprocessed at shutdown")
+        for consumer in consumers:
+            consumer.cancel()
+        await asyncio.gather(*consumers, return_exceptions=True)
+        return self.stats
+
+    async def _read_source(self):
+        try:
+            if self.mode in ("auto", "change_stream"):
+                try:
+                    await self._loop.run_in_executor(None, self._watch_change_stream)
+                    return
+                except Exception as e:
+                    if self.mode == "change_stream":
+                        raise
+                    print(f"Change streams unavailable ({e}); polling {self.watermark_field} instead")
+            await self._poll()
+        except Exception as e:
+            print(f"Ingest worker source failed: {e}")
+            self.stop()
+
+    def _watch_change_stream(self):
+        """Blocking change stream reader, run in a worker thread"""
+        pipeline = [{"$match": {"operationType": {"$in": CHANGE_OPERATIONS}}}]
+        with self.collection.watch(pipeline, full_document="updateLookup", max_await_time_ms=1000) as stream:
+            while not self.stopping:
+                change = stream.try_next()
+                if change and change.get("fullDocument"):
+                    # Blocks this thread while the queue is full
+                    asyncio.run_coroutine_threadsafe(self._enqueue(change["fullDocument"]), self._loop).result()
+
+    def _poll_query(self):
+        if self._read_position is None:
+            return {}
+        value, last_id = self._read_position
+        if last_id is None:
+            return {self.watermark_field: {"$gt": value}}
+        return {"$or": [
+            {self.watermark_field: {"$gt": value}},
+            {self.watermark_field: value, "_id": {"$gt": last_id}},
+        ]}
+
+    def _fetch_changed(self):
+        """Blocking read of the next documents past the watermark"""
+        cursor = self.collection.find(self._poll_query()).sort([(self.watermark_field, 1), ("_id", 1)])
+        return list(cursor.limit(self.batch_size))
+
+    async def _poll(self):
+        while not self.stopping:
+            documents = await self._loop.run_in_executor(None, self._fetch_changed)
+            for document in documents:
+                self._read_position = (document.get(self.watermark_field), document.get("_id"))
+                await self._enqueue(document, self._read_position)
+                if self.stopping:
+                    return
+            if len(documents) < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _enqueue(self, document, position=None):
+        self.stats["received"] += 1
+        key = document.get("_id")
+        if position is not None:
+            # Done once the run that picks up this (or a newer) version finishes
+            entry = [position, False]
+            self._positions.append(entry)
+            self._positions_by_key.setdefault(key, []).append(entry)
+        waiting = key in self._pending or key in self._in_flight
+        self._pending[key] = (document, time.monotonic())
+        if waiting:
+            # Already queued or being processed: only the newest version is run
+            self.stats["coalesced"] += 1
+            return
+        await self._queue.put(key)
+
+    async def _consume(self):
+        while True:
+            key = await self._queue.get()
+            self._in_flight.add(key)
+            try:
+                # A newer version arriving while one runs is picked up here, before
+                # task_done(), so queue.join() cannot return with it still pending
+                while key in self._pending:
+                    document, received_at = self._pending.pop(key)
+                    positions = self._positions_by_key.pop(key, [])
+                    try:
+                        await self._handle(key, document, received_at)
+                    except Exception as e:
+                        print(f"Error ingesting resume {key}: {e}")
+                        self.stats["failed"] += 1
+                    # Not reached when cancelled at shutdown, so the watermark stays behind it
+                    self._advance_watermark(positions)
+            finally:
+                self._in_flight.discard(key)
+                self._queue.task_done()
+
+    def _advance_watermark(self, positions):
+        for entry in positions:
+            entry[1] = True
+        while self._positions and self._positions[0][1]:
+            self.watermark = self._positions.popleft()[0]
+
+    async def _handle(self, key, document, received_at):
+        previous = await self._loop.run_in_executor(None, self.output_collection.find_one, {"resume_id": key})
+        profile = await self.process(document, previous)
+        self.stats["processed"] += 1
+        if not profile:
+            return
+        if previous is not None and all(timing.get("status") == "reused"
+                                        for stage, timing in profile.get("stage_timings", {}).items() if stage != "total"):
+            self.stats["unchanged"] += 1
+            return
+        profile = {**profile, "resume_id": key}
+        profile.pop("_id", None)
+        await self._loop.run_in_executor(
+            None, lambda: self.output_collection.replace_one({"resume_id": key}, profile, upsert=True)
+        )
+        self.stats["written"] += 1
+        self.latencies.append(time.monotonic() - received_at)
+
+
+async def main():
+    worker = IngestWorker()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, worker.stop)
+        except NotImplementedError:
+            # Windows: fall back to KeyboardInterrupt
+            pass
+    print("Ingest worker running (Ctrl+C to stop)...")
+    stats = await worker.run()
+    print(f"Ingest worker stopped: {stats}, processed up to {worker.watermark}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from clients import _shared, cache_file, connect_sqlite
+
+# Cache location and policy (override through the environment)
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", cache_file("llm_cache.sqlite3"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(30 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "200000"))
+LLM_CACHE_BYPASS = os.getenv("LLM_CACHE_BYPASS", "").lower() in ("1", "true", "yes")
+
+
+class LLMResponseCache:
+    """
+    Persistent, content-addressed cache of LLM responses.
+
+    Responses are keyed on (model, hash of the whitespace-normalized prompt)
+    and stored in a local SQLite file, so identical prompts from any module
+    or any run are answered without calling the LLM. Entries expire after
+    `ttl` seconds and the least recently used ones are evicted beyond
+    `max_entries`. Hit/miss counters are kept in `stats`.
+
+    Callers that parse the response pass `accept` (e.g. parses_as_json):
+    only responses it accepts are stored, and a stored response it rejects
+    is treated as a miss, so a malformed answer is retried instead of being
+    replayed for the whole TTL.
+    """
+
+    def __init__(self, path=LLM_CACHE_PATH, ttl=LLM_CACHE_TTL, max_entries=LLM_CACHE_MAX_ENTRIES, bypass=LLM_CACHE_BYPASS):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.bypass = bypass
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "bypassed": 0, "evicted": 0, "rejected": 0}
+        self._lock = threading.Lock()
+        self._db = connect_sqlite(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, model TEXT, response TEXT, created_at REAL, accessed_at REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._db.commit()
+        self._size = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def normalize(prompt):
+        """Collapse whitespace so indentation changes do not miss the cache"""
+        return " ".join(prompt.split())
+
+    @classmethod
+    def key(cls, model, prompt):
+        return hashlib.sha256(f"{model}\0{cls.normalize(prompt)}".encode("utf-8")).hexdigest()
+
+    def get(self, model, prompt):
+        """Cached response for prompt, or None"""
+        key = self.key(model, prompt)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            if self.ttl and now - row[1] > self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                self._size -= 1
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.stats["hits"] += 1
+            return row[0]
+
+    def set(self, model, prompt, response):
+        key = self.key(model, prompt)
+        now = time.time()
+        with self._lock:
+            existed = self._db.execute("SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, now, now)
+            )
+            if not existed:
+                self._size += 1
+            if self._size > self.max_entries:
+                excess = self._size - self.max_entries
+                self._db.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)", (excess,)
+                )
+                self._size -= excess
+                self.stats["evicted"] += excess
+            self._db.commit()
+
+    def _acceptable(self, response, accept):
+        # Only successful, non-empty responses that the caller can use are worth keeping
+        if not (isinstance(response, str) and response.strip()):
+            return False
+        if accept is not None and not accept(response):
+            self.stats["rejected"] += 1
+            return False
+        return True
+
+    def _lookup(self, model, prompt, accept):
+        response = self.get(model, prompt)
+        if response is not None and accept is not None and not accept(response):
+            # Stored before the caller validated responses; fetch a fresh one
+            self.stats["rejected"] += 1
+            return None
+        return response
+
+    def cached_call(self, model, prompt, call, bypass=False, accept=None):
+        """Return the cached response for prompt, or call() and cache its result if accept(result)"""
+        if bypass or self.bypass:
+            self.stats["bypassed"] += 1
+            return call()
+        response = self._lookup(model, prompt, accept)
+        if response is not None:
+            return response
+        response = call()
+        if self._acceptable(response, accept):
+            self.set(model, prompt, response)
+        return response
+
+    async def cached_call_async(self, model, prompt, call, bypass=False, accept=None):
+        """Async variant of cached_call; call() returns an awaitable"""
+        if bypass or self.bypass:
+            self.stats["bypassed"] += 1
+            return await call()
+        response = self._lookup(model, prompt, accept)
+        if response is not None:
+            return response
+        response = await call()
+        if self._acceptable(response, accept):
+            self.set(model, prompt, response)
+        return response
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+            self._size = 0
+
+
+def parses_as_json(response, fences=True):
+    """accept= check for prompts that ask for JSON (wrapped in code fences if fences)"""
+    text = response.strip()
+    if fences:
+        text = re.sub(r"^```(?:json)?\n|\n```$", "", text, flags=re.MULTILINE).strip()
+    try:
+        json.loads(text)
+    except ValueError:
+        return False
+    return True
+
+
+def get_llm_cache():
+    """Process-wide response cache shared by every LLM caller"""
+    return _shared("llm_cache", LLMResponseCache)
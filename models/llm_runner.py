@@ -0,0 +1,151 @@
+import asyncio
+import os
+import re
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from clients import _shared, get_llm, GEMINI_MODEL
+from llm_cache import get_llm_cache
+
+# Defaults for the shared runner
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+
+
+def estimate_tokens(text):
+    """Cheap local token estimate (words and punctuation marks)"""
+    return len(re.findall(r"\w+|[^\w\s]", text or ""))
+
+
+class StatelessLLM:
+    """
+    Send every prompt on its own, with no conversation memory.
+
+    Unlike ConversationChain + ConversationBufferMemory, nothing from earlier
+    calls is prepended, so prompt size depends only on the current resume and
+    concurrent calls cannot leak context into each other. Token counts of
+    every call are recorded in `usage` (most recent `history` calls) and
+    accumulated in `totals`.
+
+    With a `cache` (LLMResponseCache), prompts seen before are answered from
+    it and never reach the LLM; `bypass=True` on run() skips the cache and
+    `accept` decides which responses are stored (see LLMResponseCache).
+    """
+
+    def __init__(self, llm=None, count_tokens=estimate_tokens, history=1000, cache=None, model_name=GEMINI_MODEL):
+        self._llm = llm
+        self.count_tokens = count_tokens
+        self.cache = cache
+        self.model_name = model_name
+        self.usage = deque(maxlen=history)
+        self.totals = {"calls": 0, "cache_hits": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def llm(self):
+        if self._llm is None:
+            self._llm = get_llm()
+        return self._llm
+
+    def run(self, prompt, bypass=False, accept=None):
+        if self.cache is None:
+            return self._invoke(prompt)
+        invoked = []
+
+        def invoke():
+            invoked.append(True)
+            return self._invoke(prompt)
+
+        response = self.cache.cached_call(self.model_name, prompt, invoke, bypass=bypass, accept=accept)
+        if not invoked:
+            with self._lock:
+                self.totals["cache_hits"] += 1
+        return response
+
+    def _invoke(self, prompt):
+        start = time.perf_counter()
+        response = self.llm.invoke(prompt)
+        text = response if isinstance(response, str) else getattr(response, "content", str(response))
+
+        record = {
+            "prompt_tokens": self.count_tokens(prompt),
+            "completion_tokens": self.count_tokens(text),
+            "latency_s": time.perf_counter() - start,
+        }
+        with self._lock:
+            self.usage.append(record)
+            self.totals["calls"] += 1
+            self.totals["prompt_tokens"] += record["prompt_tokens"]
+            self.totals["completion_tokens"] += record["completion_tokens"]
+        return text
+
+    __call__ = run
+
+
+class AsyncLLMRunner:
+    """
+    Run blocking LLM calls (e.g. conversation.run) without blocking the event loop.
+
+    Calls go to a dedicated thread pool; a semaphore bounds how many are in
+    flight and every call is abandoned on the asyncio side after `timeout`
+    seconds. A thread cannot be interrupted, so a timed-out call keeps its
+    semaphore slot until the thread actually returns: new calls wait for a
+    free worker instead of spending their own timeout queued in the pool.
+    gather() fans a list of prompts out concurrently.
+    """
+
+    def __init__(self, llm_call=None, max_concurrency=LLM_MAX_CONCURRENCY, timeout=LLM_TIMEOUT):
+        self.llm_call = llm_call
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm")
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def _semaphore(self):
+        # asyncio primitives are bound to one event loop
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    async def run(self, prompt, llm_call=None, timeout=None):
+        """Run one prompt; raises asyncio.TimeoutError if it takes too long"""
+        llm_call = llm_call or self.llm_call
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore()
+        await semaphore.acquire()
+        try:
+            future = loop.run_in_executor(self._executor, llm_call, prompt)
+        except BaseException:
+            semaphore.release()
+            raise
+        future.add_done_callback(lambda done: self._release(semaphore, done))
+        # shield: a timeout abandons the wait, the slot is freed only when the thread returns
+        return await asyncio.wait_for(asyncio.shield(future), timeout=timeout or self.timeout)
+
+    @staticmethod
+    def _release(semaphore, future):
+        semaphore.release()
+        if not future.cancelled():
+            # Mark an abandoned call's exception as retrieved
+            future.exception()
+
+    async def gather(self, prompts, llm_call=None, timeout=None, return_exceptions=True):
+        """Run many prompts concurrently; results keep the order of prompts"""
+        return await asyncio.gather(
+            *(self.run(prompt, llm_call, timeout) for prompt in prompts),
+            return_exceptions=return_exceptions
+        )
+
+
+def get_extraction_llm():
+    """Process-wide stateless LLM used for all extraction prompts"""
+    return _shared("extraction_llm", lambda: StatelessLLM(cache=get_llm_cache()))
+
+
+def get_llm_runner():
+    """Process-wide runner around the shared extraction LLM"""
+    return _shared("llm_runner", lambda: AsyncLLMRunner(lambda prompt: get_extraction_llm().run(prompt)))
@@ -1,24 +1,14 @@
-from dotenv import load_dotenv
-import os
 import asyncio
 import json
+from functools import partial
 import pycountry
-from geopy.geocoders import Nominatim
 from geopy.distance import geodesic
-from geopy.exc import GeocoderTimedOut, GeocoderServiceError
 from phonenumbers.phonenumberutil import region_code_for_country_code
 from cleaned import process_single_resume
-from langchain_google_genai import GoogleGenerativeAI
-from langchain.schema import HumanMessage
-
-# Load environment variables
-load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-GEMINI_MODEL = os.getenv("GEMINI_MODEL")
-
-# Initialize Gemini Model and Geocoder only when needed
-chat_model = None
-geolocator = Nominatim(user_agent="resume_location_finder")
+# Gemini model and geocoder are created only when needed and shared
+from geocoding import get_geocoder
+from llm_runner import get_extraction_llm, get_llm_runner
+from llm_cache import parses_as_json
 
 def get_country_from_code(country_code):
     """Convert country code to full country name"""
@@ -47,42 +37,8 @@ async def get_coordinates(city, state, country):
     Returns:
         dict: A dictionary containing latitude and longitude, or None if not found
     """
-    try:
-        # Try full location query
-        location_query = f"{city}, {state}, {country}".strip(', ')
-        location = geolocator.geocode(location_query, timeout=10)
-        
-        if location:
-            return {
-                "latitude": location.latitude,
-                "longitude": location.longitude
-            }
-        
-        # If full query fails, try city and country
-        if city and country:
-            location_query = f"{city}, {country}"
-            location = geolocator.geocode(location_query, timeout=10)
-            
-            if location:
-                return {
-                    "latitude": location.latitude,
-                    "longitude": location.longitude
-                }
-        
-        # If city fails, try country
-        location = geolocator.geocode(country, timeout=10)
-        
-        if location:
-            return {
-                "latitude": location.latitude,
-                "longitude": location.longitude
-            }
-        
-        return None
-    
-    except (GeocoderTimedOut, GeocoderServiceError) as e:
-        print(f"Geocoding error: {e}")
-        return None
+    # Offline gazetteer first; Nominatim results are cached and rate limited
+    return await get_geocoder().get_coordinates(city, state, country)
 
 def calculate_distance(location1, location2):
     
@@ -126,11 +82,6 @@ async def extract_location(city, state, country_code):
             **(coordinates or {})
         }
     
-    # Initialize the model only when needed
-    global chat_model
-    if chat_model is None:
-        chat_model = GoogleGenerativeAI(model=GEMINI_MODEL, google_api_key=GEMINI_API_KEY)
-    
     # Simplified prompt for minimal token usage
     prompt = f"""
 Convert this location data to a proper JSON with city, state, and full country name:
@@ -141,8 +92,11 @@ Country: {country_name or country_code or 'Unknown'}
 Return ONLY a valid JSON with these three fields.
 """
     
-    # Use LLM for missing information
-    response = chat_model.invoke([HumanMessage(content=prompt)])
+    # Use LLM for missing information (in a worker thread, not on the event loop)
+    # Only answers json.loads can read below are cached
+    response = await get_llm_runner().run(
+        prompt, partial(get_extraction_llm().run, accept=partial(parses_as_json, fences=False))
+    )
     
     try:
         location_data = json.loads(response)
@@ -0,0 +1,91 @@
+import json
+from functools import cached_property
+
+# orjson decodes large parser payloads several times faster; fall back to json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(text):
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+
+class ParsedResume:
+    """
+    resumeParseData decoded once per document.
+
+    Every cleaning step takes this object instead of the raw JSON string;
+    the views below are computed on first access and memoized. str() gives
+    the original text, so it can be dropped into prompts unchanged.
+    """
+
+    def __init__(self, resume_parse_data):
+        self._raw = resume_parse_data
+
+    @classmethod
+    def of(cls, resume_parse_data):
+        """Wrap a raw string/dict, or return an existing ParsedResume as is"""
+        return resume_parse_data if isinstance(resume_parse_data, cls) else cls(resume_parse_data)
+
+    def __str__(self):
+        return self.text
+
+    @cached_property
+    def text(self):
+        if isinstance(self._raw, str):
+            return self._raw
+        return json.dumps(self._raw) if self._raw else ""
+
+    @cached_property
+    def data(self):
+        if isinstance(self._raw, dict):
+            return self._raw
+        if not self._raw or not isinstance(self._raw, str):
+            return {}
+        try:
+            data = loads(self._raw)
+        except ValueError as e:
+            # json.JSONDecodeError and orjson.JSONDecodeError are both ValueErrors
+            print(f"Error decoding resumeParseData: {e}")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @cached_property
+    def pretty_text(self):
+        """Indented JSON used in LLM prompts"""
+        return json.dumps(self.data, indent=2)
+
+    @cached_property
+    def contact_info(self):
+        return self.data.get("ContactInformation", {})
+
+    @cached_property
+    def location(self):
+        return self.contact_info.get("Location", {})
+
+    @cached_property
+    def skills(self):
+        """Sorted distinct skill names from the SkillsData -> Taxonomies -> SubTaxonomies tree"""
+        skills = set()
+        for skills_data in self.data.get("SkillsData", []):
+            for taxonomy in skills_data.get("Taxonomies", []):
+                for sub_taxonomy in taxonomy.get("SubTaxonomies", []):
+                    for skill_item in sub_taxonomy.get("Skills", []):
+                        skill_name = skill_item.get("Name")
+                        if skill_name:
+                            skills.add(skill_name)
+        return sorted(skills)
+
+    @cached_property
+    def positions(self):
+        return self.data.get("EmploymentHistory", {}).get("Positions", [])
+
+    @cached_property
+    def languages(self):
+        return [lang.get("Language", "").strip() for lang in self.data.get("LanguageCompetencies", []) if lang.get("Language")]
+
+    @cached_property
+    def projects(self):
+        return self.data.get("Projects", [])
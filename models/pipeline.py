@@ -0,0 +1,123 @@
+import asyncio
+import json
+import time
+from cleaned import process_single_resume
+from company import process_companies
+from location import extract_location
+from stability import analyze_stability
+
+
+async def clean_stage(results, data, previous):
+    return await process_single_resume(data, previous)
+
+
+async def location_stage(results, data, previous):
+    cleaned_data = results["cleaned"]
+    return await extract_location(cleaned_data.get("City", ""), cleaned_data.get("State", ""),
+                                  cleaned_data.get("Country Code", ""))
+
+
+async def company_stage(results, data, previous):
+    return await process_companies(results["cleaned"].get("Employment History", []))
+
+
+async def stability_stage(results, data, previous):
+    return await analyze_stability(results["cleaned"])
+
+
+# stage: (dependencies, function, key in the merged profile, output fingerprint that
+# lets an incremental run reuse the previous result)
+STAGES = {
+    "cleaned": ((), clean_stage, None, None),
+    "location": (("cleaned",), location_stage, "Location Details", "location"),
+    "companies": (("cleaned",), company_stage, "Company Details", "companies"),
+    "stability": (("cleaned",), stability_stage, "Stability Analysis", "stability"),
+}
+
+
+async def run_stages(stages, data=None, previous=None):
+    """
+    Run a dependency graph of async stages, each as soon as its dependencies finish.
+
+    Returns ({stage: result}, {stage: timing}). A failed stage is recorded
+    with its error and every stage depending on it (or on a stage that
+    returned None) is skipped; independent stages still run.
+    """
+    results, timings, tasks = {}, {}, {}
+    start = time.perf_counter()
+
+    async def run(name):
+        dependencies, function, profile_key, reuse_section = stages[name]
+        if dependencies:
+            await asyncio.gather(*(tasks[dependency] for dependency in dependencies))
+        if any(timings[dependency]["status"] in ("failed", "skipped") or results.get(dependency) is None
+               for dependency in dependencies):
+            timings[name] = {"status": "skipped", "seconds": 0.0}
+            return
+
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            # Reuse the previous result when the inputs of this stage did not change
+            current = (results.get("cleaned") or {}).get("fingerprints", {})
+            if (previous and reuse_section and profile_key in previous
+                    and previous.get("fingerprints", {}).get(reuse_section) == current.get(reuse_section)):
+                results[name] = previous[profile_key]
+                status = "reused"
+            else:
+                results[name] = await function(results, data, previous)
+                if previous is not None and results[name] is previous:
+                    status = "reused"
+        except Exception as e:
+            print(f"Stage {name} failed: {e}")
+            timings[name] = {"status": "failed", "error": str(e),
+                             "started": round(started - start, 4), "seconds": round(time.perf_counter() - started, 4)}
+            return
+        timings[name] = {"status": status, "started": round(started - start, 4),
+                         "seconds": round(time.perf_counter() - started, 4)}
+
+    for name in stages:
+        tasks[name] = asyncio.ensure_future(run(name))
+    await asyncio.gather(*tasks.values())
+    return results, timings
+
+
+async def process_candidate(data=None, previous=None, stages=STAGES):
+    """
+    Clean one resume once, then enrich it with company, location and
+    stability data concurrently.
+
+    Returns a single merged profile: the cleaned record plus one key per
+    enrichment stage and per-stage timings under "stage_timings". Pass the
+    previously stored profile as `previous` to reuse unchanged sections.
+    """
+    start = time.perf_counter()
+    results, timings = await run_stages(stages, data, previous)
+    cleaned_data = results.get("cleaned")
+    if not cleaned_data:
+        return None
+
+    profile = {**cleaned_data}
+    for name, (_, _, profile_key, _) in stages.items():
+        if profile_key and name in results:
+            profile[profile_key] = results[name]
+    timings["total"] = {"seconds": round(time.perf_counter() - start, 4)}
+    profile["stage_timings"] = timings
+    return profile
+
+
+async def main():
+    profile = await process_candidate()
+    if not profile:
+        print("No resume found.")
+        return
+
+    with open("candidate_profile.json", "w") as f:
+        json.dump(profile, f, indent=4, default=str)
+
+    for stage, timing in profile["stage_timings"].items():
+        print(f"{stage}: {timing.get('status', '')} {timing['seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,17 +2,7 @@ from cleaned import process_single_resume
 import json
 import datetime
 import asyncio
-from langchain_google_genai import GoogleGenerativeAI
-from langchain.chains import LLMChain
-from langchain.memory import ConversationBufferMemory
-from langchain.prompts import PromptTemplate
-import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-GEMINI_MODEL = os.getenv("GEMINI_MODEL")
+from llm_runner import get_extraction_llm, get_llm_runner
 
 def extract_employment_data(resume_data):
     """Extract and format employment history from resume data."""
@@ -55,39 +45,44 @@ def extract_employment_data(resume_data):
 
     return structured_data
 
+def build_stability_prompt(employment_summary):
+    return (
+        f"Here is the employment summary (short and only relevant): {employment_summary}. "
+        "Based on this data, please provide a professional analysis of job stability in line with company standards."
+    )
+
 def analyze_with_llm(employment_summary):
     """Use LLM to generate a professional job stability analysis."""
-    llm = GoogleGenerativeAI(model=GEMINI_MODEL, google_api_key=GEMINI_API_KEY)
-    prompt_template = PromptTemplate(
-        input_variables=["employment_summary"],
-        template=(
-            "Here is the employment summary (short and only relevant): {employment_summary}. "
-            "Based on this data, please provide a professional analysis of job stability in line with company standards."
-        )
-    )
-    chain = LLMChain(llm=llm, memory=ConversationBufferMemory(), prompt=prompt_template)
-    return chain.run({"employment_summary": employment_summary})
+    # Stateless call: no conversation memory is carried between analyses
+    return get_extraction_llm().run(build_stability_prompt(employment_summary))
 
-async def main():
-    resume_data = await process_single_resume()
+async def analyze_stability(resume_data):
+    """Employment data plus LLM stability analysis for a cleaned resume (None without employment history)"""
     employment_data = extract_employment_data(resume_data)
-    
     if not employment_data:
-        print("No Employment History found.")
-        return
+        return None
 
     employment_summary = "\n".join([
         f"{entry['company']}: {entry['months_worked']} months – {entry['tenure_category']}"
         for entry in employment_data if entry['months_worked'] is not None
     ])
 
-    analysis = analyze_with_llm(employment_summary)
+    # Off the event loop, so it can run alongside the other enrichment stages
+    analysis = await get_llm_runner().run(build_stability_prompt(employment_summary), get_extraction_llm().run)
 
-    result = {
+    return {
         "employment_data": employment_data,
         "analysis": analysis
     }
 
+async def main():
+    resume_data = await process_single_resume()
+    result = await analyze_stability(resume_data)
+    
+    if not result:
+        print("No Employment History found.")
+        return
+
     with open("analysis.json", "w") as f:
         json.dump(result, f, indent=4)
 
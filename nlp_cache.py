@@ -0,0 +1,154 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict, namedtuple
+import numpy as np
+
+# What we keep from a spaCy parse: noun chunk texts (None when the text was
+# only vectorized, not parsed), doc.vector and token count
+ParsedText = namedtuple('ParsedText', ['noun_chunks', 'vector', 'n_tokens'])
+
+# Components not needed for noun chunks (which only need tagger + parser)
+PARSE_DISABLE = ['ner', 'lemmatizer']
+
+
+class NLPCache:
+    """Content-hash keyed cache of spaCy parses
+    
+    Each distinct text is run through nlp() once (the pipeline itself can be
+    given as a loader and is then only loaded on the first miss); noun chunks, the document
+    vector and the token count are kept in an in-memory LRU and optionally
+    in an SQLite file shared across runs/processes. Boilerplate role
+    descriptions pasted by many candidates therefore only cost one parse.
+    """
+    
+    def __init__(self, nlp=None, max_entries=50000, disk_path=None, loader=None):
+        self._nlp = nlp
+        self.loader = loader
+        self.max_entries = max_entries
+        self.disk_path = disk_path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if disk_path:
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS parses "
+                "(key TEXT PRIMARY KEY, noun_chunks TEXT, vector BLOB, n_tokens INTEGER)"
+            )
+            self._db.commit()
+    
+    @property
+    def nlp(self):
+        """spaCy pipeline, loaded through loader on first use"""
+        if self._nlp is None:
+            self._nlp = self.loader()
+        return self._nlp
+    
+    @staticmethod
+    def key(text):
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+    
+    def analyze(self, text, parse=True):
+        """Return the ParsedText for text, parsing it only on a cache miss
+        
+        With parse=False only doc.vector is needed, so a miss just tokenizes
+        the text (static vectors need no pipeline components).
+        """
+        key = self.key(text)
+        parsed = self._get(key)
+        if parsed is not None and (not parse or parsed.noun_chunks is not None):
+            self.hits += 1
+            return parsed
+        
+        self.misses += 1
+        doc = self.nlp(text) if parse or not hasattr(self.nlp, 'make_doc') else self.nlp.make_doc(text)
+        parsed = self.from_doc(doc)
+        self._put(key, parsed)
+        return parsed
+    
+    def prefetch(self, texts, parse=True, batch_size=256, n_process=1):
+        """Bulk-parse all distinct uncached texts with nlp.pipe
+        
+        Only the components the stage needs are enabled: tagger/parser for
+        noun chunks (parse=True), none at all for vectors (parse=False).
+        """
+        missing = []
+        seen = set()
+        for text in texts:
+            key = self.key(text)
+            if key in seen:
+                continue
+            seen.add(key)
+            parsed = self._get(key)
+            if parsed is None or (parse and parsed.noun_chunks is None):
+                missing.append(text)
+        if not missing:
+            return 0
+        
+        pipe_names = getattr(self.nlp, 'pipe_names', [])
+        disable = [name for name in pipe_names if name in PARSE_DISABLE] if parse else list(pipe_names)
+        docs = self.nlp.pipe(missing, batch_size=batch_size, n_process=n_process, disable=disable)
+        for text, doc in zip(missing, docs):
+            self.store_doc(text, doc)
+        self.misses += len(missing)
+        return len(missing)
+    
+    def store_doc(self, text, doc):
+        """Add an already parsed Doc (e.g. from nlp.pipe) to the cache"""
+        parsed = self.from_doc(doc)
+        self._put(self.key(text), parsed)
+        return parsed
+    
+    def noun_chunks(self, text):
+        return self.analyze(text).noun_chunks
+    
+    def vector(self, text):
+        return self.analyze(text, parse=False).vector
+    
+    @staticmethod
+    def from_doc(doc):
+        try:
+            noun_chunks = tuple(chunk.text for chunk in doc.noun_chunks)
+        except ValueError:
+            # Docs without a dependency parse cannot produce noun chunks
+            noun_chunks = None
+        return ParsedText(noun_chunks, np.asarray(doc.vector, dtype=np.float32), len(doc))
+    
+    def _get(self, key):
+        with self._lock:
+            parsed = self._entries.get(key)
+            if parsed is not None:
+                self._entries.move_to_end(key)
+                return parsed
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT noun_chunks, vector, n_tokens FROM parses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        noun_chunks = json.loads(row[0])
+        parsed = ParsedText(
+            tuple(noun_chunks) if noun_chunks is not None else None,
+            np.frombuffer(row[1], dtype=np.float32),
+            row[2]
+        )
+        self._put(key, parsed, persist=False)
+        return parsed
+    
+    def _put(self, key, parsed, persist=True):
+        with self._lock:
+            self._entries[key] = parsed
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if persist and self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO parses VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(parsed.noun_chunks), parsed.vector.tobytes(), parsed.n_tokens)
+                )
+                self._db.commit()
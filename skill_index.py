@@ -0,0 +1,89 @@
+import numpy as np
+
+NGRAM = 3
+
+
+def _ngrams(text, n=NGRAM):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def _popcount(bits):
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bits).astype(np.int64)
+    return np.unpackbits(bits.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1).astype(np.int64)
+
+
+class SkillIndex:
+    """Precomputed skill postings for scoring a whole candidate pool
+
+    - every distinct lowercased skill gets a canonical integer id
+    - a character n-gram inverted index (skill id postings per n-gram)
+      finds the skills containing a required skill as a substring without
+      scanning the vocabulary
+    - skill id -> candidate rows postings, stored CSR style
+
+    For a job, each required skill sets one bit in a per-candidate bitset
+    and the match count is a popcount, so no per-candidate string work is
+    done at query time.
+    """
+
+    def __init__(self, skills_per_candidate):
+        self.vocab = {}
+        owner, code, count = [], [], []
+        for row, skills in enumerate(skills_per_candidate):
+            distinct = set(s.lower() for s in skills)
+            count.append(len(distinct))
+            for skill in distinct:
+                owner.append(row)
+                code.append(self.vocab.setdefault(skill, len(self.vocab)))
+        self.size = len(count)
+        self.skill_count = np.array(count, dtype=np.int64)
+        self.terms = list(self.vocab)
+
+        # skill id -> candidate rows (CSR)
+        code = np.array(code, dtype=np.int64)
+        order = np.argsort(code, kind='stable')
+        self.posting_rows = np.array(owner, dtype=np.int64)[order]
+        self.posting_offsets = np.concatenate([[0], np.cumsum(np.bincount(code, minlength=len(self.vocab)))])
+
+        # n-gram -> skill ids
+        ngram_postings = {}
+        for skill_id, term in enumerate(self.terms):
+            for gram in _ngrams(term):
+                ngram_postings.setdefault(gram, []).append(skill_id)
+        self.ngram_postings = {gram: np.array(ids, dtype=np.int64) for gram, ids in ngram_postings.items()}
+
+    def matching_skill_ids(self, skill):
+        """Ids of vocabulary skills containing `skill` as a substring"""
+        skill = skill.lower()
+        grams = _ngrams(skill)
+        if not grams:
+            # Too short for an n-gram lookup; the vocabulary is small next to the pool
+            return np.array([i for i, term in enumerate(self.terms) if skill in term], dtype=np.int64)
+        postings = sorted((self.ngram_postings.get(gram) for gram in grams), key=lambda p: 0 if p is None else len(p))
+        if postings[0] is None:
+            return np.zeros(0, dtype=np.int64)
+        ids = postings[0]
+        for posting in postings[1:]:
+            ids = np.intersect1d(ids, posting, assume_unique=True)
+            if not len(ids):
+                return ids
+        # n-grams present does not mean they are contiguous; verify the survivors
+        return np.array([i for i in ids if skill in self.terms[i]], dtype=np.int64)
+
+    def candidate_rows(self, skill_ids):
+        """Rows of candidates having any of skill_ids (may contain duplicates)"""
+        if not len(skill_ids):
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate([self.posting_rows[self.posting_offsets[i]:self.posting_offsets[i + 1]] for i in skill_ids])
+
+    def match_counts(self, required_skills):
+        """Number of required skills each candidate has (substring match)"""
+        required_skills = list(required_skills)
+        counts = np.zeros(self.size, dtype=np.int64)
+        for start in range(0, len(required_skills), 64):
+            bits = np.zeros(self.size, dtype=np.uint64)
+            for bit, skill in enumerate(required_skills[start:start + 64]):
+                bits[self.candidate_rows(self.matching_skill_ids(skill))] |= np.uint64(1 << bit)
+            counts += _popcount(bits)
+        return counts
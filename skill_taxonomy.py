@@ -0,0 +1,234 @@
+"""Canonical skill ids and a linear-time skill matcher.
+
+The taxonomy is compiled from the parser's SkillsData trees
+(SkillsData -> Taxonomies -> SubTaxonomies -> Skills, with Variations as
+aliases) seen across the corpus, plus a synonym file. Free text is matched
+against every alias at once with a token-level Aho-Corasick automaton, so
+skill extraction is one pass over the text and yields compact integer ids.
+
+Aliases that are also ordinary English ("Express", "REST", "Node") are
+only accepted as a whole entry of a skills list, and short acronyms that
+double as words or abbreviations ("ML", "TS", "UI") only match running
+text when written in capitals, so prose like "express interest" or "the
+rest of the team" does not produce skills.
+
+Build a taxonomy file from parsed resumes:
+    python skill_taxonomy.py Resume_parsed.json [...] -o skill_taxonomy.json
+"""
+import argparse
+import json
+import os
+import re
+from collections import deque
+
+SKILL_SYNONYMS_PATH = os.getenv(
+    "SKILL_SYNONYMS_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_synonyms.json")
+)
+SKILL_TAXONOMY_PATH = os.getenv("SKILL_TAXONOMY_PATH", "skill_taxonomy.json")
+
+# Tokens keep the punctuation that is part of skill names: node.js, c#, c++, .net
+_TOKEN = re.compile(r"(?:(?<!\S)\.)?[a-z0-9+#]+(?:\.[a-z0-9+#]+)*", re.IGNORECASE)
+
+# Single-word skill names/aliases that are common English words: matched
+# only as a whole skills-list entry (canonical_id), never inside free text
+LIST_ONLY_WORDS = {
+    "access", "express", "go", "less", "meteor", "node", "rest", "shell", "spring", "swift", "ember",
+}
+
+# Short acronyms that also occur as words or everyday abbreviations: matched
+# in free text only when written in capitals
+CAPITALIZED_ONLY_WORDS = {"ml", "ts", "ui", "ux", "ci", "cd", "qa", "pm", "ai", "bi"}
+
+
+def _tokens(text):
+    return _TOKEN.findall(text or "")
+
+
+def tokenize(text):
+    return [token.lower() for token in _tokens(text)]
+
+
+def normalize_skill(name):
+    return " ".join(tokenize(name))
+
+
+class SkillTaxonomy:
+    """Canonical skills, their aliases and a compiled Aho-Corasick matcher"""
+
+    def __init__(self):
+        self.names = []
+        self.categories = []
+        self.alias_ids = {}
+        self._automaton = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name, aliases=(), category=None):
+        """Register a skill (or extend an existing one) and return its id"""
+        keys = [normalize_skill(alias) for alias in (name, *aliases)]
+        keys = [key for key in keys if key]
+        if not keys:
+            return None
+        # Merge into the skill that already owns the name or any alias
+        skill_id = next((self.alias_ids[key] for key in keys if key in self.alias_ids), None)
+        if skill_id is None:
+            skill_id = len(self.names)
+            self.names.append(name.strip())
+            self.categories.append(category)
+        for key in keys:
+            self.alias_ids.setdefault(key, skill_id)
+        self._automaton = None
+        return skill_id
+
+    def add_skills_data(self, skills_data):
+        """Add every skill (and its Variations) from one resume's SkillsData list"""
+        for tree in skills_data or []:
+            for taxonomy in tree.get("Taxonomies", []):
+                for sub_taxonomy in taxonomy.get("SubTaxonomies", []):
+                    category = f"{taxonomy.get('Name', '')} / {sub_taxonomy.get('SubTaxonomyName', '')}"
+                    for skill in sub_taxonomy.get("Skills", []):
+                        if skill.get("Name"):
+                            variations = [v.get("Name") for v in skill.get("Variations", []) if v.get("Name")]
+                            self.add(skill["Name"], variations, category)
+
+    def add_synonyms(self, synonyms):
+        """Add a {canonical name: [aliases]} mapping"""
+        for name, aliases in synonyms.items():
+            self.add(name, aliases)
+
+    @classmethod
+    def from_resumes(cls, resumes, synonyms_path=SKILL_SYNONYMS_PATH):
+        """Compile a taxonomy from raw resume documents (resumeParseData JSON strings)"""
+        taxonomy = cls()
+        if synonyms_path and os.path.exists(synonyms_path):
+            with open(synonyms_path, encoding="utf-8") as f:
+                taxonomy.add_synonyms(json.load(f))
+        for resume in resumes:
+            parse_data = resume.get("resumeParseData", "")
+            if isinstance(parse_data, str):
+                try:
+                    parse_data = json.loads(parse_data) if parse_data else {}
+                except json.JSONDecodeError:
+                    continue
+            taxonomy.add_skills_data(parse_data.get("SkillsData", []))
+        return taxonomy
+
+    def to_dict(self):
+        aliases = [[] for _ in self.names]
+        for key, skill_id in self.alias_ids.items():
+            aliases[skill_id].append(key)
+        return {"skills": [{"name": name, "category": category, "aliases": alias_keys}
+                           for name, category, alias_keys in zip(self.names, self.categories, aliases)]}
+
+    @classmethod
+    def from_dict(cls, data):
+        taxonomy = cls()
+        for skill in data.get("skills", []):
+            taxonomy.add(skill["name"], skill.get("aliases", []), skill.get("category"))
+        return taxonomy
+
+    def save(self, path=SKILL_TAXONOMY_PATH):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+    @classmethod
+    def load(cls, path=SKILL_TAXONOMY_PATH):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def _compile(self):
+        """Token-level Aho-Corasick automaton over all aliases usable in free text"""
+        goto, fail, output = [{}], [0], [None]
+        for key, skill_id in self.alias_ids.items():
+            if key in LIST_ONLY_WORDS:
+                continue
+            node = 0
+            for token in key.split(" "):
+                if token not in goto[node]:
+                    goto.append({})
+                    fail.append(0)
+                    output.append(None)
+                    goto[node][token] = len(goto) - 1
+                node = goto[node][token]
+            output[node] = (len(key.split(" ")), skill_id, key in CAPITALIZED_ONLY_WORDS)
+
+        # Breadth-first failure links; dict_out points at the longest proper
+        # suffix node that ends an alias
+        dict_out = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and token not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(token, 0) if goto[state].get(token) != child else 0
+                dict_out[child] = fail[child] if output[fail[child]] else dict_out[fail[child]]
+        self._automaton = (goto, fail, output, dict_out)
+        return self._automaton
+
+    def find(self, text):
+        """[(start_token, n_tokens, skill_id)], leftmost-longest, non-overlapping"""
+        goto, fail, output, dict_out = self._automaton or self._compile()
+        matches = []
+        node = 0
+        for position, original in enumerate(_tokens(text)):
+            token = original.lower()
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            hit = node if output[node] else dict_out[node]
+            while hit:
+                length, skill_id, capitalized_only = output[hit]
+                if not capitalized_only or original.isupper():
+                    matches.append((position - length + 1, length, skill_id))
+                hit = dict_out[hit]
+
+        selected, covered_until = [], 0
+        for start, length, skill_id in sorted(matches, key=lambda m: (m[0], -m[1])):
+            if start >= covered_until:
+                selected.append((start, length, skill_id))
+                covered_until = start + length
+        return selected
+
+    def match(self, text):
+        """Distinct canonical skill ids mentioned in text, in order of appearance"""
+        return list(dict.fromkeys(skill_id for _, _, skill_id in self.find(text)))
+
+    def canonical_id(self, skill):
+        """Id of a skill name or alias (exact, after normalization), else None"""
+        return self.alias_ids.get(normalize_skill(skill))
+
+    def canonicalize(self, skills):
+        """Canonical ids for a list of skill strings; unknown ones fall back to text matching"""
+        ids = []
+        for skill in skills:
+            skill_id = self.canonical_id(skill)
+            ids.extend([skill_id] if skill_id is not None else self.match(skill))
+        return list(dict.fromkeys(ids))
+
+    def skill_names(self, ids):
+        return [self.names[skill_id] for skill_id in ids]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a skill taxonomy from parsed resumes")
+    parser.add_argument("resumes", nargs="+", help="JSON files with one resume document or a list of them")
+    parser.add_argument("--synonyms", default=SKILL_SYNONYMS_PATH)
+    parser.add_argument("-o", "--output", default=SKILL_TAXONOMY_PATH)
+    args = parser.parse_args()
+
+    resumes = []
+    for path in args.resumes:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        resumes.extend(data if isinstance(data, list) else [data])
+    taxonomy = SkillTaxonomy.from_resumes(resumes, args.synonyms)
+    taxonomy.save(args.output)
+    print(f"{len(taxonomy)} skills, {len(taxonomy.alias_ids)} aliases -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import heapq
+import numpy as np
+
+
+def top_n_items(items, top_n, key):
+    """Return the top_n items with the highest key, streaming over items.
+    
+    Only top_n items are held in a bounded heap at any time, so a generator
+    of results never has to be materialized. Ties keep their input order,
+    exactly like sorted(items, key=key, reverse=True)[:top_n].
+    """
+    if top_n <= 0:
+        return []
+    return heapq.nlargest(top_n, items, key=key)
+
+
+def top_n_indices(scores, top_n):
+    """Return indices of the top_n highest scores, best first.
+    
+    Uses argpartition (O(n)) and only sorts the selected top_n entries.
+    Ties keep their input order, exactly like a stable descending argsort.
+    """
+    scores = np.asarray(scores)
+    size = len(scores)
+    if top_n <= 0 or size == 0:
+        return np.empty(0, dtype=np.int64)
+    if top_n >= size:
+        return np.argsort(-scores, kind='stable')
+    
+    # Value of the top_n-th highest score
+    kth = size - top_n
+    threshold = scores[np.argpartition(scores, kth)[kth]]
+    
+    # Everything above the threshold, then the earliest ties to fill up top_n
+    above = np.flatnonzero(scores > threshold)
+    ties = np.flatnonzero(scores == threshold)[:top_n - len(above)]
+    selected = np.sort(np.concatenate([above, ties]))
+    return selected[np.argsort(-scores[selected], kind='stable')]